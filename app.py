@@ -1,5 +1,13 @@
-from flask import Flask, render_template, request, jsonify
-from simucombats import Joueur, combat  # Assurez-vous d'importer vos classes et fonctions existantes
+import json
+import os
+import time
+
+from flask import Flask, Response, g, render_template, request, jsonify, stream_with_context
+from cache_combats import CacheResultats, empreinte_combat
+from mesures import Mesures
+from stockage import NIVEAUX, Stockage, comptes_depuis_donnees
+from travaux import ETATS_FINAUX, TERMINE, FilePleine, FileTravaux
+from simucombats import DETAIL_COMPLET, ENVIRONNEMENTS, NOMBRE_TOURS_MAX, Joueur, activer_mesures, combat, creer_joueur, prechauffer_stats, table_stats  # Assurez-vous d'importer vos classes et fonctions existantes
 
 app = Flask(__name__)
 
@@ -7,6 +15,84 @@ app = Flask(__name__)
 joueur1 = Joueur("Joueur 1")
 joueur2 = Joueur("Joueur 2")
 
+# Cache des rapports de combat (taille et durée de vie configurables)
+cache_rapports = CacheResultats(
+    taille_max=int(os.environ.get("SIMU_CACHE_TAILLE", 1024)),
+    duree_vie=float(os.environ.get("SIMU_CACHE_DUREE", 600)),
+)
+
+# Armées et profils de bonus enregistrés, partagés entre workers et redémarrages
+stockage = Stockage(os.environ.get("SIMU_STOCKAGE", "armees.db"))
+
+# Travaux asynchrones : simulations longues exécutées hors de la requête, avec un nombre
+# borné de travaux en cours au total et par client
+file_travaux = FileTravaux(
+    workers=int(os.environ.get("SIMU_TRAVAUX_WORKERS", 2)),
+    capacite=int(os.environ.get("SIMU_TRAVAUX_CAPACITE", 64)),
+    par_client=int(os.environ.get("SIMU_TRAVAUX_PAR_CLIENT", 8)),
+)
+
+# Instrumentation exposée sur /metrics (désactivée avec SIMU_MESURES=0)
+mesures = Mesures()
+MESURES_ACTIVES = os.environ.get("SIMU_MESURES", "1") != "0"
+if MESURES_ACTIVES:
+    activer_mesures(mesures)
+
+
+def combat_en_cache(attaquant, defenseur, environment, rapide=False, detail=DETAIL_COMPLET, suivi=None,
+                    entier=False):
+    """
+    Lance le combat sur des copies des joueurs, ou renvoie le rapport déjà calculé pour
+    les mêmes armées (dans le même ordre), bonus, environnement, modes et niveau de détail.
+    `suivi` est transmis à combat (il n'est pas appelé si le rapport est en cache).
+    """
+    cle = empreinte_combat(attaquant, defenseur, environment, rapide, detail, entier)
+    rapport = cache_rapports.obtenir(cle)
+    if rapport is None:
+        rapport = combat(attaquant.copier(), defenseur.copier(), environment, rapide, detail, suivi, entier)
+        cache_rapports.ajouter(cle, rapport)
+    return rapport
+
+
+def joueur_depuis_donnees(name, donnees):
+    """
+    Joueur décrit dans une requête JSON : texte d'armée (voir creer_joueur) ou armée
+    enregistrée, {"armee_id": 12, "profil_id": 3} ; sans profil, les niveaux sont lus
+    dans la requête comme pour un texte d'armée.
+    """
+    if "armee_id" not in donnees:
+        return creer_joueur(name, donnees)
+    profil_id = donnees.get("profil_id")
+    armee = stockage.armee(int(donnees["armee_id"]), name, None if profil_id is None else int(profil_id))
+    if profil_id is None:
+        for niveau in NIVEAUX:
+            setattr(armee, niveau, int(donnees.get(niveau, 0)))
+    return armee.vers_joueur()
+
+
+def rapport_json(rapport, detail, format_rapport=None):
+    """
+    Rapport texte par défaut ; journal structuré si un niveau de détail a été demandé ;
+    avec le format "deltas", effectifs initiaux puis seules pertes de chaque tour
+    (voir RapportCombat.vers_deltas), que la page reconstruit en texte.
+    """
+    if format_rapport == "deltas":
+        return rapport.vers_deltas()
+    if format_rapport is not None:
+        raise ValueError(f"Format de rapport inconnu : '{format_rapport}'")
+    return rapport.lignes() if detail is None else rapport.vers_dict()
+
+@app.before_request
+def debut_requete():
+    g.debut_requete = time.perf_counter()
+
+@app.after_request
+def fin_requete(reponse):
+    if MESURES_ACTIVES and request.endpoint != "metriques" and "debut_requete" in g:
+        mesures.observer("simu_requete_secondes", time.perf_counter() - g.debut_requete,
+                         route=request.endpoint or "inconnue", status=reponse.status_code)
+    return reponse
+
 @app.route("/")
 def index():
     return render_template("index.html")
@@ -14,10 +100,13 @@ def index():
 @app.route("/configurer_joueurs", methods=["POST"])
 def configurer_joueurs():
     try:
-        joueur1_data = request.form["joueur1"]
-        joueur2_data = request.form["joueur2"]
-        joueur1.importer_unites_depuis_texte(joueur1_data)
-        joueur2.importer_unites_depuis_texte(joueur2_data)
+        # Une armée enregistrée (joueur1_id, joueur2_id) remplace celle du joueur sans analyse de texte
+        for joueur, champ in ((joueur1, "joueur1"), (joueur2, "joueur2")):
+            if request.form.get(f"{champ}_id"):
+                joueur.units = stockage.armee(int(request.form[f"{champ}_id"])).vers_joueur().units
+            else:
+                joueur.importer_unites_depuis_texte(request.form[champ])
+        prechauffer_stats(joueur1, joueur2)
         return jsonify({"message": "Joueurs configurés avec succès !", "status": "success"})
     except Exception as e:
         return jsonify({"message": f"Erreur de configuration : {e}", "status": "error"})
@@ -34,6 +123,7 @@ def configurer_bonus():
         joueur2.carapace = int(request.form.get("joueur2_carapace", 0))
         joueur2.dome = int(request.form.get("joueur2_dome", 0))
         joueur2.loge = int(request.form.get("joueur2_loge", 0))
+        prechauffer_stats(joueur1, joueur2)
 
         return jsonify({"message": "Bonus configurés avec succès !", "status": "success"})
     except Exception as e:
@@ -43,10 +133,204 @@ def configurer_bonus():
 def lancer_combat():
     try:
         environment = request.form["environment"]
-        rapport = combat(joueur1, joueur2, environment)
-        return jsonify({"rapport": rapport, "status": "success"})
+        rapide = request.form.get("rapide", "0") in ("1", "true", "on")
+        entier = request.form.get("entier", "0") in ("1", "true", "on")
+        detail = request.form.get("detail")
+        format_rapport = request.form.get("format")
+        # Le combat porte sur des copies : les armées configurées restent intactes
+        rapport = combat_en_cache(joueur1, joueur2, environment, rapide, detail or DETAIL_COMPLET, entier=entier)
+        return jsonify({"rapport": rapport_json(rapport, detail, format_rapport), "status": "success"})
     except Exception as e:
         return jsonify({"message": f"Erreur lors du lancement du combat : {e}", "status": "error"})
 
+@app.route("/simulate", methods=["POST"])
+def simulate():
+    """
+    Simulation sans état : les deux armées, leurs bonus et l'environnement sont fournis
+    dans une seule requête JSON et aucun objet partagé n'est modifié.
+
+    {"attaquant": {"armee": "...", "mandibule": 0, "carapace": 0, "dome": 0, "loge": 0},
+     "defenseur": {...}, "environment": "terrain", "rapide": false, "detail": "issue"}
+
+    Une armée enregistrée peut remplacer le texte : {"armee_id": 12, "profil_id": 3}.
+    Avec "rapide", les tours identiques après un tour sans perte sont sautés.
+    Sans "detail", le rapport est renvoyé en texte ; avec "issue", "tours" ou "complet",
+    il est renvoyé sous forme structurée, sans aucun texte. Avec "format": "deltas",
+    seules les pertes non nulles de chaque tour sont envoyées. Avec "entier", le combat est
+    calculé en entiers exacts (dégâts et vies du rapport en millièmes).
+    """
+    try:
+        donnees = request.get_json(force=True)
+        environment = donnees.get("environment", "terrain")
+        if environment not in ENVIRONNEMENTS:
+            raise ValueError(f"Environnement inconnu : '{environment}'")
+        attaquant = joueur_depuis_donnees("Attaquant", donnees["attaquant"])
+        defenseur = joueur_depuis_donnees("Défenseur", donnees["defenseur"])
+        detail = donnees.get("detail")
+        rapport = combat_en_cache(attaquant, defenseur, environment, bool(donnees.get("rapide", False)),
+                                  detail or DETAIL_COMPLET, entier=bool(donnees.get("entier", False)))
+        return jsonify({"rapport": rapport_json(rapport, detail, donnees.get("format")), "status": "success"})
+    except Exception as e:
+        return jsonify({"message": f"Erreur lors de la simulation : {e}", "status": "error"})
+
+def _simuler_travail(travail, attaquant, defenseur, environment, rapide, detail, format_rapport, entier):
+    rapport = combat_en_cache(attaquant, defenseur, environment, rapide, detail or DETAIL_COMPLET, travail.suivi,
+                              entier)
+    return rapport_json(rapport, detail, format_rapport)
+
+@app.route("/travaux", methods=["POST"])
+def soumettre_travail():
+    """
+    Soumet une simulation et répond aussitôt (202) avec l'identifiant du travail.
+    Le corps JSON a la forme de celui de /simulate ; sans "attaquant" ni "defenseur",
+    les joueurs configurés sont utilisés (copiés au moment de la soumission).
+    Répond 429 si la file, ou la part du client, est pleine. Le client est identifié par son
+    adresse ; l'en-tête X-Client, choisi par le client, n'est qu'une étiquette du travail.
+    """
+    try:
+        donnees = request.get_json(force=True, silent=True) or {}
+        environment = donnees.get("environment", "terrain")
+        if environment not in ENVIRONNEMENTS:
+            raise ValueError(f"Environnement inconnu : '{environment}'")
+        if "attaquant" in donnees or "defenseur" in donnees:
+            attaquant = joueur_depuis_donnees("Attaquant", donnees["attaquant"])
+            defenseur = joueur_depuis_donnees("Défenseur", donnees["defenseur"])
+        else:
+            attaquant = joueur1.copier()
+            defenseur = joueur2.copier()
+        format_rapport = donnees.get("format")
+        if format_rapport not in (None, "deltas"):
+            raise ValueError(f"Format de rapport inconnu : '{format_rapport}'")
+        client = request.remote_addr
+        travail = file_travaux.soumettre(_simuler_travail, attaquant, defenseur, environment,
+                                         bool(donnees.get("rapide", False)), donnees.get("detail"),
+                                         format_rapport, bool(donnees.get("entier", False)), client=client,
+                                         libelle=request.headers.get("X-Client"))
+        return jsonify({"id": travail.id, "status": "success"}), 202
+    except FilePleine as e:
+        return jsonify({"message": f"Erreur lors de la soumission : {e}", "status": "error"}), 429
+    except Exception as e:
+        return jsonify({"message": f"Erreur lors de la soumission : {e}", "status": "error"})
+
+@app.route("/travaux/<travail_id>", methods=["GET"])
+def etat_travail(travail_id):
+    """État d'un travail et tour en cours (sur NOMBRE_TOURS_MAX)."""
+    travail = file_travaux.obtenir(travail_id)
+    if travail is None:
+        return jsonify({"message": "Travail inconnu", "status": "error"}), 404
+    return jsonify({**travail.vers_dict(), "tours_max": NOMBRE_TOURS_MAX, "status": "success"})
+
+@app.route("/travaux/<travail_id>/resultat", methods=["GET"])
+def resultat_travail(travail_id):
+    travail = file_travaux.obtenir(travail_id)
+    if travail is None:
+        return jsonify({"message": "Travail inconnu", "status": "error"}), 404
+    if travail.etat != TERMINE:
+        if travail.etat in ETATS_FINAUX:
+            message = travail.erreur or f"travail {travail.etat}"
+        else:
+            message = "travail non terminé"
+        return jsonify({"message": f"Erreur lors de la simulation : {message}", "etat": travail.etat,
+                        "status": "error"}), 409
+    return jsonify({"rapport": travail.resultat, "status": "success"})
+
+@app.route("/travaux/<travail_id>/annuler", methods=["POST"])
+def annuler_travail(travail_id):
+    if not file_travaux.annuler(travail_id):
+        return jsonify({"message": "Travail inconnu ou déjà terminé", "status": "error"}), 404
+    return jsonify({"message": "Annulation demandée", "status": "success"})
+
+@app.route("/armees", methods=["POST"])
+def enregistrer_armee():
+    """
+    Enregistre une armée : {"nom": ..., "proprietaire": ..., "armee": "<texte>"} ou
+    {..., "comptes": {"Tank": 1000}} ; avec "id", l'armée existante est remplacée.
+    """
+    try:
+        donnees = request.get_json(force=True)
+        armee_id = stockage.enregistrer_armee(donnees.get("nom", ""), comptes_depuis_donnees(donnees),
+                                              donnees.get("proprietaire"), donnees.get("id"))
+        return jsonify({"id": armee_id, "status": "success"})
+    except Exception as e:
+        return jsonify({"message": f"Erreur d'enregistrement de l'armée : {e}", "status": "error"})
+
+@app.route("/armees", methods=["GET"])
+def lister_armees():
+    """Armées les plus récentes, filtrées par ?proprietaire= ; ?limite= (100 par défaut)."""
+    try:
+        armees = stockage.armees(request.args.get("proprietaire"), int(request.args.get("limite", 100)))
+    except ValueError as e:
+        return jsonify({"message": f"Erreur de lecture des armées : {e}", "status": "error"}), 400
+    return jsonify({"armees": armees, "status": "success"})
+
+@app.route("/armees/<int:armee_id>", methods=["GET"])
+def lire_armee(armee_id):
+    try:
+        return jsonify({"armee": stockage.description_armee(armee_id), "status": "success"})
+    except ValueError as e:
+        return jsonify({"message": str(e), "status": "error"}), 404
+
+@app.route("/armees/<int:armee_id>", methods=["DELETE"])
+def supprimer_armee(armee_id):
+    if not stockage.supprimer_armee(armee_id):
+        return jsonify({"message": f"Armée inconnue : {armee_id}", "status": "error"}), 404
+    return jsonify({"message": "Armée supprimée", "status": "success"})
+
+@app.route("/armees/importer", methods=["POST"])
+def importer_armees():
+    """Import en masse, en une transaction : liste JSON, ou JSONL (une armée par ligne)."""
+    try:
+        if request.is_json:
+            armees = request.get_json()
+        else:
+            armees = (json.loads(ligne) for ligne in request.get_data(as_text=True).splitlines() if ligne.strip())
+        return jsonify({"importees": stockage.importer(armees), "status": "success"})
+    except Exception as e:
+        return jsonify({"message": f"Erreur d'import des armées : {e}", "status": "error"})
+
+@app.route("/armees/exporter", methods=["GET"])
+def exporter_armees():
+    """Toutes les armées (ou celles de ?proprietaire=) en JSONL, envoyées au fur et à mesure."""
+    armees = stockage.exporter(request.args.get("proprietaire"))
+    lignes = (json.dumps(armee, ensure_ascii=False) + "\n" for armee in armees)
+    return Response(stream_with_context(lignes), mimetype="application/x-ndjson")
+
+@app.route("/profils", methods=["POST"])
+def enregistrer_profil():
+    """Enregistre un profil de bonus : {"nom": ..., "proprietaire": ..., "mandibule": 0, ...}."""
+    try:
+        donnees = request.get_json(force=True)
+        profil_id = stockage.enregistrer_profil(donnees.get("nom", ""), donnees,
+                                                donnees.get("proprietaire"), donnees.get("id"))
+        return jsonify({"id": profil_id, "status": "success"})
+    except Exception as e:
+        return jsonify({"message": f"Erreur d'enregistrement du profil : {e}", "status": "error"})
+
+@app.route("/profils", methods=["GET"])
+def lister_profils():
+    try:
+        profils = stockage.profils(request.args.get("proprietaire"), int(request.args.get("limite", 100)))
+    except ValueError as e:
+        return jsonify({"message": f"Erreur de lecture des profils : {e}", "status": "error"}), 400
+    return jsonify({"profils": profils, "status": "success"})
+
+@app.route("/statistiques_cache", methods=["GET"])
+def statistiques_cache():
+    return jsonify({**cache_rapports.statistiques(), "status": "success"})
+
+@app.route("/metrics", methods=["GET"])
+def metriques():
+    """Métriques au format texte de Prometheus, dont les tables de statistiques et le cache des rapports."""
+    table = table_stats.cache_info()
+    mesures.fixer("simu_table_stats_appels_total", table.hits + table.misses, "counter")
+    mesures.fixer("simu_table_stats_succes_total", table.hits, "counter")
+    cache = cache_rapports.statistiques()
+    mesures.fixer("simu_cache_rapports_succes_total", cache["succes"], "counter")
+    mesures.fixer("simu_cache_rapports_echecs_total", cache["echecs"], "counter")
+    mesures.fixer("simu_cache_rapports_taille", cache["taille"])
+    for etat, nombre in file_travaux.statistiques().items():
+        mesures.fixer("simu_travaux", nombre, etat=etat)
+    return Response(mesures.exporter(), mimetype="text/plain; version=0.0.4")
+
 if __name__ == "__main__":
-    app.run(debug=True)
+    app.run(debug=True, threaded=True)
@@ -0,0 +1,171 @@
+"""
+Balayage des niveaux de bonus et des environnements pour des armées fixes.
+
+Le domaine est découpé en lots simulés en parallèle (un processus par cœur) ; chaque lot
+renvoie des résultats compacts (issue, tours, survivants par type d'unité), écrits dans
+un CSV au fur et à mesure. Un balayage interrompu reprend là où il s'était arrêté.
+
+Exemple de grille (JSON) :
+{
+    "attaquant": {"armee": "10 000 Tanks", "mandibule": [0, 10, 20, 30], "carapace": 0},
+    "defenseur": {"armee": "5 000 Gardiennes", "dome": [0, 15, 30]},
+    "environnements": ["terrain", "dome", "loge"]
+}
+Chaque niveau est un entier ou une liste d'entiers ; les niveaux absents valent 0.
+"""
+
+import argparse
+import csv
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from simubatch import ISSUES, comptes_depuis_joueur, simuler_lot
+from simucombats import ENVIRONNEMENTS, TYPES_UNITES, creer_joueur
+
+
+NIVEAUX = ("mandibule", "carapace", "dome", "loge")
+TAILLE_LOT = 2000
+
+
+def _valeurs(valeur):
+    """Un niveau de la grille : entier ou liste d'entiers."""
+    if isinstance(valeur, (list, tuple, range)):
+        return [int(v) for v in valeur]
+    return [int(valeur)]
+
+
+class Grille:
+    """
+    Domaine d'un balayage : deux armées fixes, les niveaux de chacune et les environnements.
+    Les points sont numérotés de 0 à len(grille) - 1, le dernier axe variant le plus vite.
+    """
+
+    def __init__(self, spec):
+        attaquant = spec.get("attaquant", {})
+        defenseur = spec.get("defenseur", {})
+        self.comptes_attaquant = comptes_depuis_joueur(creer_joueur("Attaquant", {"armee": attaquant.get("armee", "")}))
+        self.comptes_defenseur = comptes_depuis_joueur(creer_joueur("Defenseur", {"armee": defenseur.get("armee", "")}))
+        self.environnements = list(spec.get("environnements", ENVIRONNEMENTS))
+        for env in self.environnements:
+            if env not in ENVIRONNEMENTS:
+                raise ValueError(f"Environnement inconnu : {env!r}")
+        # Axes : niveaux de l'attaquant, niveaux du défenseur, environnement
+        self.axes = (
+            [_valeurs(attaquant.get(niveau, 0)) for niveau in NIVEAUX]
+            + [_valeurs(defenseur.get(niveau, 0)) for niveau in NIVEAUX]
+            + [list(range(len(self.environnements)))]
+        )
+        self.dimensions = tuple(len(axe) for axe in self.axes)
+        # Seuls les types d'unités présents dans l'une des armées ont une colonne
+        self.types = [i for i in range(len(TYPES_UNITES))
+                      if self.comptes_attaquant[i] or self.comptes_defenseur[i]]
+
+    def __len__(self):
+        return int(np.prod(self.dimensions))
+
+    def colonnes(self):
+        """En-tête du CSV produit par `balayer`."""
+        noms = [TYPES_UNITES[i].__name__ for i in self.types]
+        return (["indice", "environnement"]
+                + [f"att_{niveau}" for niveau in NIVEAUX]
+                + [f"def_{niveau}" for niveau in NIVEAUX]
+                + ["issue", "tours"]
+                + [f"att_{nom}" for nom in noms]
+                + [f"def_{nom}" for nom in noms])
+
+    def simuler(self, debut, fin):
+        """Simule les points [debut, fin) d'un seul appel vectorisé et retourne les lignes du CSV."""
+        indices = np.arange(debut, fin)
+        positions = np.unravel_index(indices, self.dimensions)
+        niveaux = np.column_stack([np.asarray(axe)[pos] for axe, pos in zip(self.axes[:-1], positions[:-1])])
+        environnements = [self.environnements[e] for e in positions[-1]]
+        resultat = simuler_lot(self.comptes_attaquant, self.comptes_defenseur,
+                               niveaux[:, :4], niveaux[:, 4:], environnements)
+        survivants_att = resultat.attaquants[:, self.types]
+        survivants_def = resultat.defenseurs[:, self.types]
+        lignes = []
+        for k, indice in enumerate(indices.tolist()):
+            lignes.append([indice, environnements[k]]
+                          + niveaux[k].tolist()
+                          + [ISSUES[resultat.issues[k]], int(resultat.tours[k])]
+                          + survivants_att[k].tolist()
+                          + survivants_def[k].tolist())
+        return lignes
+
+
+def _simuler_lot(grille, debut, fin):
+    return grille.simuler(debut, fin)
+
+
+def _indices_termines(chemin):
+    """
+    Relit un CSV existant et retourne les indices déjà écrits.
+    Une dernière ligne incomplète (balayage coupé pendant une écriture) est retirée du fichier.
+    """
+    if not os.path.exists(chemin):
+        return set()
+    with open(chemin, "rb") as fichier:
+        contenu = fichier.read()
+    fin = contenu.rfind(b"\n") + 1
+    if fin < len(contenu):
+        with open(chemin, "r+b") as fichier:
+            fichier.truncate(fin)
+    lignes = contenu[:fin].decode("utf-8").splitlines()
+    return {int(ligne.split(",", 1)[0]) for ligne in lignes[1:] if ligne}
+
+
+def balayer(spec, chemin, workers=None, taille_lot=TAILLE_LOT, progression=None):
+    """
+    Lance le balayage décrit par `spec` et écrit les résultats dans le CSV `chemin`.
+
+    Les lots sont répartis sur `workers` processus (un par cœur par défaut) et écrits
+    dans l'ordre où ils se terminent. Si `chemin` existe déjà, seuls les points absents
+    du fichier sont simulés. `progression(fait, total)` est appelée après chaque lot.
+    Retourne le nombre de points simulés par cet appel.
+    """
+    grille = Grille(spec)
+    total = len(grille)
+    termines = _indices_termines(chemin)
+    lots = [(debut, min(debut + taille_lot, total)) for debut in range(0, total, taille_lot)]
+    lots = [(debut, fin) for debut, fin in lots
+            if any(i not in termines for i in range(debut, fin))]
+
+    nouveau = not os.path.exists(chemin) or os.path.getsize(chemin) == 0
+    simules = 0
+    with open(chemin, "a", newline="", encoding="utf-8") as fichier:
+        ecrivain = csv.writer(fichier)
+        if nouveau:
+            ecrivain.writerow(grille.colonnes())
+            fichier.flush()
+        with ProcessPoolExecutor(max_workers=workers) as executeur:
+            futures = [executeur.submit(_simuler_lot, grille, debut, fin) for debut, fin in lots]
+            for future in as_completed(futures):
+                lignes = [ligne for ligne in future.result() if ligne[0] not in termines]
+                ecrivain.writerows(lignes)
+                fichier.flush()
+                simules += len(lignes)
+                if progression:
+                    progression(len(termines) + simules, total)
+    return simules
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Balayage parallèle des bonus et des environnements.")
+    parser.add_argument("grille", help="fichier JSON décrivant la grille")
+    parser.add_argument("sortie", help="fichier CSV de résultats (repris s'il existe)")
+    parser.add_argument("--workers", type=int, default=None, help="nombre de processus (défaut : un par cœur)")
+    parser.add_argument("--taille-lot", type=int, default=TAILLE_LOT, help="nombre de combats par lot")
+    args = parser.parse_args()
+
+    with open(args.grille, encoding="utf-8") as fichier:
+        spec = json.load(fichier)
+    simules = balayer(spec, args.sortie, args.workers, args.taille_lot,
+                      progression=lambda fait, total: print(f"{fait}/{total}", end="\r", flush=True))
+    print(f"\n{simules} combats simulés.")
+
+
+if __name__ == "__main__":
+    main()
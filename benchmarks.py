@@ -0,0 +1,235 @@
+"""
+Mesures de performance du moteur, reproductibles (armées tirées avec une graine fixe).
+
+    python benchmarks.py --enregistrer reference.json      # mesure et enregistre une référence
+    python benchmarks.py --comparer reference.json          # échoue si un scénario régresse
+    python benchmarks.py --filtre combat_taille --repetitions 9
+
+Chaque scénario est exécuté `repetitions` fois ; on garde le meilleur temps par appel,
+le moins sensible au bruit de la machine. Une comparaison échoue (code de sortie 1)
+si un scénario est plus lent que la référence de plus de `seuil` (25 % par défaut).
+Les scénarios dont une dépendance manque (NumPy, Flask) sont ignorés.
+"""
+
+import argparse
+import json
+import platform
+import os
+import random
+import subprocess
+import sys
+import time
+
+from simucombats import ENVIRONNEMENTS, TYPES_UNITES, UNITES_BASE, Joueur, analyser_armees, combat
+
+
+GRAINE = 2024
+SEUIL = 0.25
+
+
+def _texte_armee(comptes):
+    return ", ".join(f"{compte} {unit.name}" for unit, compte in zip(UNITES_BASE, comptes) if compte)
+
+
+def _joueur(name, comptes, niveaux=(0, 0, 0, 0)):
+    joueur = Joueur(name)
+    for unit_class, compte in zip(TYPES_UNITES, comptes):
+        if compte:
+            joueur.ajouter_unite(unit_class, compte)
+    joueur.mandibule, joueur.carapace, joueur.dome, joueur.loge = niveaux
+    return joueur
+
+
+def _repartir(aleatoire, total, types):
+    """Répartit `total` unités au hasard entre les indices de `types`."""
+    comptes = [0] * len(TYPES_UNITES)
+    coupures = sorted(aleatoire.randint(0, total) for _ in range(len(types) - 1))
+    for i, (debut, fin) in zip(types, zip([0] + coupures, coupures + [total])):
+        comptes[i] = fin - debut
+    return comptes
+
+
+def _niveaux(aleatoire):
+    return tuple(aleatoire.randint(0, 30) for _ in range(4))
+
+
+# Chaque scénario reçoit un générateur aléatoire et retourne (fonction à mesurer, nombre d'appels).
+# Les combats portent sur des copies des joueurs : le temps de copie est compris.
+
+def _scenario_combat_taille(exposant, entier=False):
+    def preparer(aleatoire):
+        types = aleatoire.sample(range(len(TYPES_UNITES)), 4)
+        attaquant = _joueur("A", _repartir(aleatoire, 10**exposant, types), _niveaux(aleatoire))
+        defenseur = _joueur("D", _repartir(aleatoire, 10**exposant, types), _niveaux(aleatoire))
+        nombre = 50
+        return lambda: [combat(attaquant.copier(), defenseur.copier(), "terrain", entier=entier)
+                        for _ in range(nombre)], nombre
+    return preparer
+
+
+def _scenario_tous_types(environment):
+    def preparer(aleatoire):
+        attaquant = _joueur("A", [aleatoire.randint(10**3, 10**6) for _ in TYPES_UNITES], _niveaux(aleatoire))
+        defenseur = _joueur("D", [aleatoire.randint(10**3, 10**6) for _ in TYPES_UNITES], _niveaux(aleatoire))
+        nombre = 50
+        return lambda: [combat(attaquant.copier(), defenseur.copier(), environment) for _ in range(nombre)], nombre
+    return preparer
+
+
+def _scenario_rapport(forme):
+    """Sérialisation JSON du rapport du plus long de 500 combats tirés au hasard (15 types d'unités)."""
+    def preparer(aleatoire):
+        rapport = None
+        for _ in range(500):
+            joueurs = []
+            for name in "AD":
+                exposant = aleatoire.randint(2, 9)
+                comptes = [aleatoire.randint(1, 10**exposant) for _ in TYPES_UNITES]
+                joueurs.append(_joueur(name, comptes, _niveaux(aleatoire)))
+            essai = combat(*joueurs, aleatoire.choice(ENVIRONNEMENTS))
+            if rapport is None or essai.nombre_tours > rapport.nombre_tours:
+                rapport = essai
+        rendre = rapport.lignes if forme == "texte" else rapport.vers_deltas
+        nombre = 100
+        return lambda: [json.dumps(rendre()) for _ in range(nombre)], nombre
+    return preparer
+
+
+def _preparer_analyse(aleatoire):
+    textes = [_texte_armee([aleatoire.randint(0, 10**7) for _ in TYPES_UNITES]) for _ in range(2000)]
+    return lambda: analyser_armees(textes), len(textes)
+
+
+def _preparer_import_joueur(aleatoire):
+    textes = [_texte_armee([aleatoire.randint(0, 10**7) for _ in TYPES_UNITES]) for _ in range(2000)]
+    return lambda: [Joueur("J").importer_unites_depuis_texte(texte) for texte in textes], len(textes)
+
+
+def _preparer_lot(aleatoire):
+    from simubatch import simuler_lot
+
+    n = 10000
+    attaquants = [_repartir(aleatoire, aleatoire.randint(10**2, 10**7), aleatoire.sample(range(15), 3))
+                  for _ in range(n)]
+    defenseurs = [_repartir(aleatoire, aleatoire.randint(10**2, 10**7), aleatoire.sample(range(15), 3))
+                  for _ in range(n)]
+    environments = [aleatoire.choice(ENVIRONNEMENTS) for _ in range(n)]
+    return lambda: simuler_lot(attaquants, defenseurs, (0, 0, 0, 0), (0, 0, 0, 0), environments), n
+
+
+def _scenario_flask(avec_cache):
+    def preparer(aleatoire):
+        import app
+
+        client = app.app.test_client()
+        types = aleatoire.sample(range(len(TYPES_UNITES)), 4)
+        client.post("/configurer_joueurs", data={
+            "joueur1": _texte_armee(_repartir(aleatoire, 10**6, types)),
+            "joueur2": _texte_armee(_repartir(aleatoire, 10**6, types)),
+        })
+        nombre = 50
+
+        def executer():
+            for _ in range(nombre):
+                if not avec_cache:
+                    app.cache_rapports.vider()
+                reponse = client.post("/lancer_combat", data={"environment": "dome"})
+                if reponse.get_json()["status"] != "success":
+                    raise RuntimeError(reponse.get_json()["message"])
+        return executer, nombre
+    return preparer
+
+
+def _preparer_import_moteur(aleatoire):
+    """Démarrage à froid d'un processus qui importe le moteur (interpréteur compris)."""
+    commande = [sys.executable, "-c", "import simucombats"]
+    dossier = os.path.dirname(os.path.abspath(__file__))
+    nombre = 5
+    return lambda: [subprocess.run(commande, cwd=dossier, check=True) for _ in range(nombre)], nombre
+
+
+SCENARIOS = {
+    **{f"combat_taille_1e{e}": _scenario_combat_taille(e) for e in (2, 3, 5, 7, 9)},
+    **{f"combat_entier_1e{e}": _scenario_combat_taille(e, entier=True) for e in (5, 9)},
+    **{f"combat_tous_types_{env}": _scenario_tous_types(env) for env in ENVIRONNEMENTS},
+    "rapport_texte": _scenario_rapport("texte"),
+    "rapport_deltas": _scenario_rapport("deltas"),
+    "analyse_textes": _preparer_analyse,
+    "import_joueurs": _preparer_import_joueur,
+    "lot_10000": _preparer_lot,
+    "flask_lancer_combat": _scenario_flask(False),
+    "flask_lancer_combat_cache": _scenario_flask(True),
+    "import_moteur": _preparer_import_moteur,
+}
+
+
+def mesurer(noms=None, repetitions=5):
+    """
+    Exécute les scénarios et retourne {nom: secondes par appel} (meilleur des répétitions).
+    Un scénario dont une dépendance manque est absent du résultat.
+    """
+    resultats = {}
+    for nom, preparer in SCENARIOS.items():
+        if noms is not None and nom not in noms:
+            continue
+        try:
+            executer, nombre = preparer(random.Random(GRAINE))
+        except ImportError as e:
+            print(f"{nom:32} ignoré ({e})", file=sys.stderr)
+            continue
+        executer()  # échauffement : caches et tables de statistiques
+        meilleur = float("inf")
+        for _ in range(repetitions):
+            debut = time.perf_counter()
+            executer()
+            meilleur = min(meilleur, time.perf_counter() - debut)
+        resultats[nom] = meilleur / nombre
+    return resultats
+
+
+def comparer(resultats, reference, seuil=SEUIL):
+    """Retourne les scénarios plus lents que la référence de plus de `seuil`, avec leur rapport."""
+    regressions = {}
+    for nom, secondes in resultats.items():
+        if nom in reference and secondes > reference[nom] * (1 + seuil):
+            regressions[nom] = secondes / reference[nom]
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mesures de performance du simulateur.")
+    parser.add_argument("--filtre", default="", help="ne garder que les scénarios contenant ce texte")
+    parser.add_argument("--repetitions", type=int, default=5)
+    parser.add_argument("--enregistrer", metavar="FICHIER", help="enregistre les résultats comme référence")
+    parser.add_argument("--comparer", metavar="FICHIER", help="compare à une référence enregistrée")
+    parser.add_argument("--seuil", type=float, default=SEUIL, help="ralentissement toléré (0.25 = 25 %%)")
+    args = parser.parse_args()
+
+    noms = [nom for nom in SCENARIOS if args.filtre in nom]
+    resultats = mesurer(noms, args.repetitions)
+
+    reference = {}
+    if args.comparer:
+        with open(args.comparer, encoding="utf-8") as fichier:
+            reference = json.load(fichier)["scenarios"]
+    for nom, secondes in resultats.items():
+        ligne = f"{nom:32} {secondes * 1e6:12.1f} µs"
+        if nom in reference:
+            ligne += f"   x{secondes / reference[nom]:.2f}"
+        print(ligne)
+
+    if args.enregistrer:
+        with open(args.enregistrer, "w", encoding="utf-8") as fichier:
+            json.dump({"python": platform.python_version(), "machine": platform.machine(),
+                       "scenarios": resultats}, fichier, indent=2)
+
+    if args.comparer:
+        regressions = comparer(resultats, reference, args.seuil)
+        for nom, rapport in regressions.items():
+            print(f"Régression : {nom} est {rapport:.2f} fois plus lent que la référence", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
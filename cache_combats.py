@@ -0,0 +1,85 @@
+"""Cache des résultats de combat, indexé par une empreinte des deux armées."""
+
+import threading
+import time
+from collections import OrderedDict
+
+
+def empreinte_joueur(joueur):
+    """
+    Empreinte d'un joueur : nom, niveaux de bonus et quantités par type d'unité.
+    Les unités restent dans l'ordre d'import, qui est celui dans lequel les pertes sont
+    appliquées : deux armées rangées différemment ne partagent pas leur rapport.
+    """
+    unites = tuple((unit.name, unit.unit_count) for unit in joueur.units.values())
+    return (joueur.name, joueur.mandibule, joueur.carapace, joueur.dome, joueur.loge, unites)
+
+
+def empreinte_combat(attaquant, defenseur, environment, rapide=False, detail=None, entier=False):
+    """Clé de cache d'un combat."""
+    return (environment, rapide, detail, entier, empreinte_joueur(attaquant), empreinte_joueur(defenseur))
+
+
+class CacheResultats:
+    """
+    Cache LRU à durée de vie limitée, utilisable depuis plusieurs threads.
+    - taille_max : nombre maximal de résultats conservés.
+    - duree_vie : durée de validité d'un résultat, en secondes.
+    Les compteurs `succes` et `echecs` servent à dimensionner le cache.
+    """
+
+    def __init__(self, taille_max=1024, duree_vie=600.0):
+        self.taille_max = taille_max
+        self.duree_vie = duree_vie
+        self.succes = 0
+        self.echecs = 0
+        self._entrees = OrderedDict()
+        self._verrou = threading.Lock()
+
+    def obtenir(self, cle):
+        """Retourne le résultat associé à la clé, ou None s'il est absent ou expiré."""
+        with self._verrou:
+            entree = self._entrees.get(cle)
+            if entree is not None and entree[0] > time.monotonic():
+                self._entrees.move_to_end(cle)
+                self.succes += 1
+                return entree[1]
+            if entree is not None:
+                del self._entrees[cle]
+            self.echecs += 1
+            return None
+
+    def ajouter(self, cle, resultat):
+        """Enregistre un résultat, en évinçant les entrées les moins récemment utilisées."""
+        with self._verrou:
+            maintenant = time.monotonic()
+            self._entrees[cle] = (maintenant + self.duree_vie, resultat)
+            self._entrees.move_to_end(cle)
+            while len(self._entrees) > self.taille_max:
+                self._entrees.popitem(last=False)
+            # Les entrées expirées les moins récemment utilisées partent aussi
+            while self._entrees:
+                expiration, _ = next(iter(self._entrees.values()))
+                if expiration > maintenant:
+                    break
+                self._entrees.popitem(last=False)
+
+    def vider(self):
+        """Supprime toutes les entrées et remet les compteurs à zéro."""
+        with self._verrou:
+            self._entrees.clear()
+            self.succes = 0
+            self.echecs = 0
+
+    def statistiques(self):
+        """Compteurs du cache, pour le dimensionner."""
+        with self._verrou:
+            total = self.succes + self.echecs
+            return {
+                "succes": self.succes,
+                "echecs": self.echecs,
+                "taux_succes": self.succes / total if total else 0.0,
+                "taille": len(self._entrees),
+                "taille_max": self.taille_max,
+                "duree_vie": self.duree_vie,
+            }
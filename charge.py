@@ -0,0 +1,127 @@
+"""
+Test de charge de /simulate : débit selon le nombre de workers.
+
+Chaque worker est un processus qui sert l'application sur son propre port ; les requêtes
+sont réparties à tour de rôle entre eux par des clients concurrents (deux par worker).
+Toutes les requêtes portent sur des armées différentes, pour ne pas mesurer le cache.
+
+    python charge.py --workers 1 2 4 --requetes 400
+
+Le gain n'est linéaire que si la machine a au moins autant de cœurs que de workers.
+"""
+
+import argparse
+import http.client
+import json
+import logging
+import multiprocessing
+import os
+import random
+import socket
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from simucombats import ENVIRONNEMENTS, UNITES_BASE
+
+
+GRAINE = 2024
+
+
+def _port_libre():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _servir(port, pret, stockage):
+    os.environ["SIMU_STOCKAGE"] = stockage
+    os.environ["SIMU_MESURES"] = "0"
+    logging.getLogger("werkzeug").setLevel(logging.ERROR)
+    from werkzeug.serving import make_server
+
+    import app
+
+    serveur = make_server("127.0.0.1", port, app.app)
+    pret.set()
+    serveur.serve_forever()
+
+
+def _armee(aleatoire):
+    unites = aleatoire.sample(UNITES_BASE, aleatoire.randint(1, 6))
+    return {
+        "armee": ", ".join(f"{aleatoire.randint(10**3, 10**7)} {unit.name}" for unit in unites),
+        "mandibule": aleatoire.randint(0, 30),
+        "carapace": aleatoire.randint(0, 30),
+        "dome": aleatoire.randint(0, 30),
+        "loge": aleatoire.randint(0, 30),
+    }
+
+
+def corps_requetes(nombre, graine=GRAINE):
+    """Corps JSON de `nombre` requêtes /simulate, toutes différentes."""
+    aleatoire = random.Random(graine)
+    return [json.dumps({"attaquant": _armee(aleatoire), "defenseur": _armee(aleatoire),
+                        "environment": aleatoire.choice(ENVIRONNEMENTS), "detail": "issue"}).encode()
+            for _ in range(nombre)]
+
+
+def mesurer(workers, corps):
+    """Lance `workers` serveurs, envoie toutes les requêtes et retourne le débit (requêtes par seconde)."""
+    contexte = multiprocessing.get_context("spawn")
+    ports = [_port_libre() for _ in range(workers)]
+    with tempfile.TemporaryDirectory() as dossier:
+        stockage = os.path.join(dossier, "armees.db")
+        processus = []
+        for port in ports:
+            pret = contexte.Event()
+            p = contexte.Process(target=_servir, args=(port, pret, stockage), daemon=True)
+            p.start()
+            pret.wait(30)
+            processus.append(p)
+        try:
+            locale = threading.local()
+
+            def envoyer(k):
+                connexions = getattr(locale, "connexions", None)
+                if connexions is None:
+                    connexions = locale.connexions = {port: http.client.HTTPConnection("127.0.0.1", port)
+                                                      for port in ports}
+                connexion = connexions[ports[k % workers]]
+                connexion.request("POST", "/simulate", corps[k], {"Content-Type": "application/json"})
+                reponse = json.loads(connexion.getresponse().read())
+                if reponse["status"] != "success":
+                    raise RuntimeError(reponse["message"])
+
+            with ThreadPoolExecutor(max_workers=2 * workers) as clients:
+                # Échauffement : une requête par worker
+                list(clients.map(envoyer, range(workers)))
+                debut = time.perf_counter()
+                list(clients.map(envoyer, range(len(corps))))
+                duree = time.perf_counter() - debut
+        finally:
+            for p in processus:
+                p.terminate()
+                p.join()
+    return len(corps) / duree
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Débit de /simulate selon le nombre de workers.")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--requetes", type=int, default=400)
+    args = parser.parse_args()
+
+    corps = corps_requetes(args.requetes)
+    print(f"{os.cpu_count()} cœurs disponibles")
+    reference = None
+    for workers in args.workers:
+        debit = mesurer(workers, corps)
+        reference = reference or debit / workers
+        print(f"{workers:3} workers : {debit:8.1f} requêtes/s   x{debit / reference:.2f}   "
+              f"efficacité {debit / (reference * workers):.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""Interface graphique Tk du simulateur. Le moteur de combat est dans simucombats."""
+
+import tkinter as tk
+from tkinter import messagebox, ttk
+
+from simucombats import Joueur, combat, prechauffer_stats
+
+
+class CombatApp:
+    def __init__(self, root):
+        self.root = root
+        self.root.title("Simulateur de Combat")
+        
+        # Joueurs
+        self.joueur1 = Joueur("Joueur 1")
+        self.joueur2 = Joueur("Joueur 2")
+
+        # Interface
+        self.create_widgets()
+
+    def create_widgets(self):
+        # Zone de configuration des joueurs
+        frame_joueurs = tk.Frame(self.root)
+        frame_joueurs.pack(pady=10)
+
+        tk.Label(frame_joueurs, text="Joueur 1:").grid(row=0, column=0, padx=5, pady=5)
+        self.joueur1_entry = tk.Entry(frame_joueurs, width=50)
+        self.joueur1_entry.grid(row=0, column=1, padx=5, pady=5)
+
+        tk.Label(frame_joueurs, text="Joueur 2:").grid(row=1, column=0, padx=5, pady=5)
+        self.joueur2_entry = tk.Entry(frame_joueurs, width=50)
+        self.joueur2_entry.grid(row=1, column=1, padx=5, pady=5)
+
+        tk.Button(frame_joueurs, text="Configurer Joueurs", command=self.configurer_joueurs).grid(row=2, column=0, columnspan=2, pady=10)
+
+        # Zone de configuration des bonus
+        frame_bonus = tk.Frame(self.root)
+        frame_bonus.pack(pady=10)
+
+        tk.Label(frame_bonus, text="Joueur").grid(row=0, column=0, padx=5, pady=5)
+        tk.Label(frame_bonus, text="Mandibule").grid(row=0, column=1, padx=5, pady=5)
+        tk.Label(frame_bonus, text="Carapace").grid(row=0, column=2, padx=5, pady=5)
+        tk.Label(frame_bonus, text="Dôme").grid(row=0, column=3, padx=5, pady=5)
+        tk.Label(frame_bonus, text="Loge").grid(row=0, column=4, padx=5, pady=5)
+
+        # Joueur 1
+        tk.Label(frame_bonus, text="Joueur 1").grid(row=1, column=0, padx=5, pady=5)
+        self.joueur1_mandibule = tk.Entry(frame_bonus, width=5)
+        self.joueur1_mandibule.grid(row=1, column=1, padx=5, pady=5)
+        self.joueur1_carapace = tk.Entry(frame_bonus, width=5)
+        self.joueur1_carapace.grid(row=1, column=2, padx=5, pady=5)
+        self.joueur1_dome = tk.Entry(frame_bonus, width=5)
+        self.joueur1_dome.grid(row=1, column=3, padx=5, pady=5)
+        self.joueur1_loge = tk.Entry(frame_bonus, width=5)
+        self.joueur1_loge.grid(row=1, column=4, padx=5, pady=5)
+
+        # Joueur 2
+        tk.Label(frame_bonus, text="Joueur 2").grid(row=2, column=0, padx=5, pady=5)
+        self.joueur2_mandibule = tk.Entry(frame_bonus, width=5)
+        self.joueur2_mandibule.grid(row=2, column=1, padx=5, pady=5)
+        self.joueur2_carapace = tk.Entry(frame_bonus, width=5)
+        self.joueur2_carapace.grid(row=2, column=2, padx=5, pady=5)
+        self.joueur2_dome = tk.Entry(frame_bonus, width=5)
+        self.joueur2_dome.grid(row=2, column=3, padx=5, pady=5)
+        self.joueur2_loge = tk.Entry(frame_bonus, width=5)
+        self.joueur2_loge.grid(row=2, column=4, padx=5, pady=5)
+
+        tk.Button(frame_bonus, text="Configurer Bonus", command=self.configurer_bonus).grid(row=3, column=0, columnspan=5, pady=10)
+
+        # Zone de simulation
+        frame_simulation = tk.Frame(self.root)
+        frame_simulation.pack(pady=10)
+
+        tk.Label(frame_simulation, text="Environnement:").grid(row=0, column=0, padx=5, pady=5)
+        self.environment_combobox = ttk.Combobox(frame_simulation, values=["terrain", "dome", "loge"], state="readonly")
+        self.environment_combobox.set("terrain")
+        self.environment_combobox.grid(row=0, column=1, padx=5, pady=5)
+
+        tk.Button(frame_simulation, text="Lancer Combat", command=self.lancer_combat).grid(row=1, column=0, columnspan=2, pady=10)
+
+        # Zone d'affichage des résultats
+        self.result_text = tk.Text(self.root, height=20, width=80)
+        self.result_text.pack(pady=10)
+
+    def configurer_joueurs(self):
+        """Configure les joueurs à partir des entrées."""
+        try:
+            self.joueur1.importer_unites_depuis_texte(self.joueur1_entry.get())
+            self.joueur2.importer_unites_depuis_texte(self.joueur2_entry.get())
+            messagebox.showinfo("Succès", "Joueurs configurés avec succès !")
+            self.afficher_armee()
+        except Exception as e:
+            messagebox.showerror("Erreur", f"Erreur de configuration : {e}")
+
+    def configurer_bonus(self):
+        """Configure les bonus pour chaque joueur."""
+        try:
+            self.joueur1.mandibule = int(self.joueur1_mandibule.get() or 0)
+            self.joueur1.carapace = int(self.joueur1_carapace.get() or 0)
+            self.joueur1.dome = int(self.joueur1_dome.get() or 0)
+            self.joueur1.loge = int(self.joueur1_loge.get() or 0)
+
+            self.joueur2.mandibule = int(self.joueur2_mandibule.get() or 0)
+            self.joueur2.carapace = int(self.joueur2_carapace.get() or 0)
+            self.joueur2.dome = int(self.joueur2_dome.get() or 0)
+            self.joueur2.loge = int(self.joueur2_loge.get() or 0)
+            prechauffer_stats(self.joueur1, self.joueur2)
+
+            messagebox.showinfo("Succès", "Bonus configurés avec succès !")
+            self.afficher_armee()
+        except Exception as e:
+            messagebox.showerror("Erreur", f"Erreur de configuration des bonus : {e}")
+
+    def afficher_armee(self):
+        """Affiche l'armée finale des deux joueurs."""
+        self.result_text.delete(1.0, tk.END)
+        self.result_text.insert(tk.END, f"Armée du Joueur 1 ({self.joueur1.name}):\n")
+        for unit in self.joueur1.units.values():
+            self.result_text.insert(tk.END, f"  {unit.name} : {unit.unit_count} unités\n")
+        
+        self.result_text.insert(tk.END, f"\nArmée du Joueur 2 ({self.joueur2.name}):\n")
+        for unit in self.joueur2.units.values():
+            self.result_text.insert(tk.END, f"  {unit.name} : {unit.unit_count} unités\n")
+
+    def lancer_combat(self):
+        """Lance un combat entre les deux joueurs."""
+        environment = self.environment_combobox.get()
+        rapport = "\n".join(combat(self.joueur1, self.joueur2, environment).lignes())
+        self.result_text.delete(1.0, tk.END)
+        self.result_text.insert(tk.END, rapport)
+
+
+def lancer_interface():
+    root = tk.Tk()
+    app = CombatApp(root)
+    root.mainloop()
+
+
+# Lancer l'application
+if __name__ == "__main__":
+    lancer_interface()
@@ -0,0 +1,115 @@
+"""
+Instrumentation optionnelle du simulateur : compteurs, jauges et histogrammes,
+exportés au format texte de Prometheus. Aucune dépendance externe.
+
+Le moteur n'enregistre rien tant que simucombats.activer_mesures n'a pas été appelé.
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+
+
+# Bornes par défaut des histogrammes de durée, en secondes
+BORNES_SECONDES = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+
+def _cle(labels):
+    return tuple(sorted(labels.items()))
+
+
+def _format_labels(labels, supplementaires=()):
+    paires = list(labels) + list(supplementaires)
+    if not paires:
+        return ""
+    return "{" + ",".join(f'{nom}="{valeur}"' for nom, valeur in paires) + "}"
+
+
+def _format_nombre(valeur):
+    if valeur == float("inf"):
+        return "+Inf"
+    return repr(float(valeur)) if isinstance(valeur, float) else str(valeur)
+
+
+class Mesures:
+    """
+    Métriques nommées, avec des labels optionnels, utilisables depuis plusieurs threads.
+    - compter : compteur croissant (nom terminé par _total).
+    - fixer : valeur lue au moment de l'export (jauge, ou compteur tenu ailleurs).
+    - observer : histogramme cumulatif sur `bornes`.
+    """
+
+    def __init__(self, bornes=BORNES_SECONDES):
+        self.bornes = tuple(bornes)
+        self._types = {}
+        self._valeurs = {}
+        self._histogrammes = {}
+        self._verrou = threading.Lock()
+
+    def compter(self, nom, valeur=1, **labels):
+        cle = (nom, _cle(labels))
+        with self._verrou:
+            self._types.setdefault(nom, "counter")
+            self._valeurs[cle] = self._valeurs.get(cle, 0) + valeur
+
+    def fixer(self, nom, valeur, type_metrique="gauge", **labels):
+        with self._verrou:
+            self._types[nom] = type_metrique
+            self._valeurs[(nom, _cle(labels))] = valeur
+
+    def observer(self, nom, valeur, **labels):
+        cle = (nom, _cle(labels))
+        with self._verrou:
+            self._types.setdefault(nom, "histogram")
+            histogramme = self._histogrammes.get(cle)
+            if histogramme is None:
+                # Un compte par borne, plus +Inf, puis la somme des valeurs
+                histogramme = self._histogrammes[cle] = [0] * (len(self.bornes) + 1) + [0.0]
+            for i, borne in enumerate(self.bornes):
+                if valeur <= borne:
+                    histogramme[i] += 1
+                    break
+            else:
+                histogramme[len(self.bornes)] += 1
+            histogramme[-1] += valeur
+
+    @contextmanager
+    def chronometre(self, nom, **labels):
+        """Observe la durée du bloc dans l'histogramme `nom`."""
+        debut = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observer(nom, time.perf_counter() - debut, **labels)
+
+    def vider(self):
+        with self._verrou:
+            self._types.clear()
+            self._valeurs.clear()
+            self._histogrammes.clear()
+
+    def exporter(self):
+        """Texte au format d'exposition de Prometheus (version 0.0.4)."""
+        with self._verrou:
+            types = dict(self._types)
+            valeurs = dict(self._valeurs)
+            histogrammes = {cle: list(h) for cle, h in self._histogrammes.items()}
+
+        lignes = []
+        for nom in sorted(types):
+            lignes.append(f"# TYPE {nom} {types[nom]}")
+            if types[nom] == "histogram":
+                for (nom_h, labels), histogramme in sorted(histogrammes.items()):
+                    if nom_h != nom:
+                        continue
+                    cumul = 0
+                    for borne, compte in zip(self.bornes + (float("inf"),), histogramme):
+                        cumul += compte
+                        lignes.append(f"{nom}_bucket{_format_labels(labels, [('le', _format_nombre(borne))])} {cumul}")
+                    lignes.append(f"{nom}_sum{_format_labels(labels)} {_format_nombre(histogramme[-1])}")
+                    lignes.append(f"{nom}_count{_format_labels(labels)} {cumul}")
+            else:
+                for (nom_v, labels), valeur in sorted(valeurs.items()):
+                    if nom_v == nom:
+                        lignes.append(f"{nom}{_format_labels(labels)} {_format_nombre(valeur)}")
+        return "\n".join(lignes) + "\n"
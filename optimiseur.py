@@ -0,0 +1,202 @@
+"""Recherche des plus petites armées capables de battre une défense donnée."""
+
+import itertools
+
+import numpy as np
+
+from simubatch import ISSUE_NUL, ISSUE_VICTOIRE, comptes_depuis_joueur, simuler_lot
+from simucombats import TYPES_UNITES
+
+
+QUANTITE_MAX = 10**15
+
+
+def _bonus_joueur(joueur):
+    return (joueur.mandibule, joueur.carapace, joueur.dome, joueur.loge)
+
+
+class _Evaluateur:
+    """Évalue d'un seul appel vectorisé un lot d'armées attaquantes contre le défenseur."""
+
+    def __init__(self, defenseur, unites, environment, bonus, accepter_nul):
+        self.defenseur = comptes_depuis_joueur(defenseur)
+        self.bonus_defenseur = _bonus_joueur(defenseur)
+        self.colonnes = [TYPES_UNITES.index(unit_class) for unit_class in unites]
+        self.environment = environment
+        self.bonus = bonus
+        self.issues = (ISSUE_VICTOIRE, ISSUE_NUL) if accepter_nul else (ISSUE_VICTOIRE,)
+
+    def gagne(self, quantites):
+        """`quantites` : tableau (N, nombre d'unités autorisées). Retourne un masque de victoires."""
+        quantites = np.asarray(quantites, dtype=np.int64)
+        attaquants = np.zeros((len(quantites), len(TYPES_UNITES)), dtype=np.int64)
+        attaquants[:, self.colonnes] = quantites
+        resultat = simuler_lot(attaquants, self.defenseur, self.bonus, self.bonus_defenseur, self.environment)
+        return np.isin(resultat.issues, self.issues)
+
+
+def _bissection(evaluateur, construire, bas, haut):
+    """
+    Cherche pour chaque ligne la plus petite quantité gagnante, sachant que `bas` perd
+    et que `haut` gagne. Toutes les lignes avancent ensemble : chaque étape est un seul
+    appel vectorisé. `construire(lignes, quantites)` fabrique les armées à évaluer.
+    """
+    bas = np.array(bas, dtype=np.int64)
+    haut = np.array(haut, dtype=np.int64)
+    while True:
+        ouvertes = np.flatnonzero(haut - bas > 1)
+        if len(ouvertes) == 0:
+            return haut
+        milieu = bas[ouvertes] + (haut[ouvertes] - bas[ouvertes]) // 2
+        victoires = evaluateur.gagne(construire(ouvertes, milieu))
+        haut[ouvertes[victoires]] = milieu[victoires]
+        bas[ouvertes[~victoires]] = milieu[~victoires]
+
+
+def _minimums_seuls(evaluateur, nombre, maximum):
+    """Quantité minimale de chaque type d'unité utilisé seul (None si introuvable)."""
+    seuls = np.eye(nombre, dtype=np.int64)
+    bas = np.zeros(nombre, dtype=np.int64)
+    haut = np.ones(nombre, dtype=np.int64)
+    trouves = np.zeros(nombre, dtype=bool)
+    # Doublement jusqu'à trouver une quantité gagnante
+    while True:
+        cherches = np.flatnonzero(~trouves & (haut <= maximum))
+        if len(cherches) == 0:
+            break
+        victoires = evaluateur.gagne(seuls[cherches] * haut[cherches, None])
+        trouves[cherches[victoires]] = True
+        perdus = cherches[~victoires]
+        bas[perdus] = haut[perdus]
+        haut[perdus] *= 2
+
+    lignes = np.flatnonzero(trouves)
+    minimums = [None] * nombre
+    resultats = _bissection(
+        evaluateur,
+        lambda ouvertes, quantites: seuls[lignes[ouvertes]] * quantites[:, None],
+        bas[lignes],
+        haut[lignes],
+    )
+    for i, minimum in zip(lignes, resultats):
+        minimums[i] = int(minimum)
+    return minimums
+
+
+def _resserrer(evaluateur, solutions):
+    """
+    Ramène chaque quantité de chaque solution gagnante à son minimum, les autres étant
+    fixées, une unité après l'autre : retirer ensuite une seule unité fait perdre.
+    Une quantité déjà ramenée au minimum le reste quand les suivantes diminuent.
+    """
+    solutions = np.array(solutions, dtype=np.int64).reshape(len(solutions), -1)
+    for j in range(solutions.shape[1]):
+        lignes = np.flatnonzero(solutions[:, j] > 0)
+        if len(lignes) == 0:
+            continue
+        # Les solutions qui gagnent encore sans cette unité la perdent entièrement
+        sans = solutions[lignes].copy()
+        sans[:, j] = 0
+        gagnantes = evaluateur.gagne(sans)
+        solutions[lignes[gagnantes], j] = 0
+        lignes = lignes[~gagnantes]
+
+        def construire(ouvertes, quantites, lignes=lignes):
+            armees = solutions[lignes[ouvertes]].copy()
+            armees[:, j] = quantites
+            return armees
+
+        solutions[lignes, j] = _bissection(evaluateur, construire, np.zeros(len(lignes), dtype=np.int64),
+                                           solutions[lignes, j])
+    return [tuple(int(q) for q in solution) for solution in solutions]
+
+
+def _non_domines(solutions):
+    """Retire les solutions dont chaque quantité est supérieure ou égale à celles d'une autre."""
+    solutions = sorted(set(solutions), key=sum)
+    front = []
+    for solution in solutions:
+        if not any(all(a <= b for a, b in zip(autre, solution)) for autre in front):
+            front.append(solution)
+    return front
+
+
+def front_pareto(defenseur, unites, environment="terrain", bonus=(0, 0, 0, 0),
+                 finesse=8, accepter_nul=False, maximum=QUANTITE_MAX):
+    """
+    Calcule un front de Pareto des armées minimales qui battent `defenseur`.
+
+    - unites : classes d'unités autorisées pour l'attaquant (Tank, Legionnaire, ...).
+    - bonus : niveaux (mandibule, carapace, dôme, loge) de l'attaquant.
+    - finesse : nombre de pas de la grille explorée pour chaque unité sauf la dernière,
+      dont la quantité minimale est trouvée par bissection.
+
+    La recherche suppose qu'ajouter des unités ne fait jamais perdre un combat gagné :
+    chaque unité est bornée par sa quantité minimale lorsqu'elle est seule, et une
+    combinaison qui gagne sans la dernière unité n'est pas explorée plus loin.
+    Chaque combinaison gagnante est ensuite resserrée : retirer une seule unité de
+    n'importe quel type d'une armée du front la fait perdre.
+    Les combats sont simulés comme par `combat`, les unités étant rangées dans l'ordre
+    de TYPES_UNITES.
+    Retourne une liste de dictionnaires {classe d'unité: quantité}, du plus petit
+    effectif total au plus grand.
+    """
+    unites = list(unites)
+    evaluateur = _Evaluateur(defenseur, unites, environment, bonus, accepter_nul)
+    nombre = len(unites)
+    if evaluateur.gagne(np.zeros((1, nombre), dtype=np.int64))[0]:
+        return [dict.fromkeys(unites, 0)]
+    minimums = _minimums_seuls(evaluateur, nombre, maximum)
+    connus = [m for m in minimums if m is not None]
+    if not connus:
+        return []
+
+    solutions = []
+    for i, minimum in enumerate(minimums):
+        if minimum is not None:
+            solution = [0] * nombre
+            solution[i] = minimum
+            solutions.append(tuple(solution))
+
+    if nombre > 1:
+        # Une unité sans solution seule est explorée jusqu'à la plus grande borne connue
+        bornes = [m if m is not None else max(connus) for m in minimums]
+        grilles = [
+            sorted({borne * pas // finesse for pas in range(finesse + 1)})
+            for borne in bornes[:-1]
+        ]
+        fixes = np.array(list(itertools.product(*grilles)), dtype=np.int64)
+        # Coupure : une combinaison qui gagne déjà sans la dernière unité est terminée
+        sans_derniere = evaluateur.gagne(np.column_stack([fixes, np.zeros(len(fixes), dtype=np.int64)]))
+        for ligne in fixes[sans_derniere]:
+            solutions.append(tuple(int(q) for q in ligne) + (0,))
+        fixes = fixes[~sans_derniere]
+        if len(fixes):
+            haut = np.full(len(fixes), bornes[-1], dtype=np.int64)
+            if minimums[-1] is None:
+                # Pas de borne garantie : on vérifie qu'elle gagne avant de bissecter
+                gagnants = evaluateur.gagne(np.column_stack([fixes, haut]))
+                fixes, haut = fixes[gagnants], haut[gagnants]
+            derniers = _bissection(
+                evaluateur,
+                lambda ouvertes, quantites: np.column_stack([fixes[ouvertes], quantites]),
+                np.zeros(len(fixes), dtype=np.int64),
+                haut,
+            )
+            for ligne, dernier in zip(fixes, derniers):
+                solutions.append(tuple(int(q) for q in ligne) + (int(dernier),))
+
+    solutions = _resserrer(evaluateur, solutions)
+    return [dict(zip(unites, solution)) for solution in _non_domines(solutions)]
+
+
+def armee_minimale(defenseur, unites, environment="terrain", bonus=(0, 0, 0, 0), couts=None, **options):
+    """
+    Retourne l'armée la moins chère du front de Pareto, ou None si aucune ne gagne.
+    `couts` associe un coût à chaque classe d'unité (1 par unité par défaut).
+    """
+    front = front_pareto(defenseur, unites, environment, bonus, **options)
+    if not front:
+        return None
+    couts = couts or {}
+    return min(front, key=lambda armee: sum(couts.get(u, 1) * q for u, q in armee.items()))
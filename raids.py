@@ -0,0 +1,176 @@
+"""
+Chaînes de raids : plusieurs vagues d'attaque successives contre un même défenseur,
+chaque vague affrontant les survivants de la précédente.
+
+Les armées sont des Armee (un vecteur d'effectifs) : l'état du défenseur entre deux
+vagues se sauvegarde et se restaure par une simple copie de ce vecteur, et les
+statistiques de base restent partagées (UNITES_BASE et la table des statistiques).
+
+    chaine = ChaineRaids([vague1, vague2, vague3], defenseur, "dome")
+    resultat = chaine.simuler()            # dans l'ordre donné
+    meilleur = chaine.ordre_optimal()      # ordre qui minimise les pertes des attaquants
+"""
+
+import itertools
+from collections import namedtuple
+
+from simucombats import DETAIL_ISSUE, ENVIRONNEMENTS, Armee, combat, prechauffer_stats
+
+
+# Au-delà de ce nombre de vagues, ordre_optimal choisit les vagues une à une
+VAGUES_MAX_EXHAUSTIF = 8
+
+ResultatChaine = namedtuple("ResultatChaine", "ordre rapports pertes pertes_totales defenseur")
+ResultatChaine.__doc__ = """
+Résultat d'une chaîne de raids :
+- ordre : indices des vagues dans l'ordre joué ;
+- rapports : RapportCombat de chaque vague, dans cet ordre ;
+- pertes : pertes de chaque vague par type d'unité (ordre de TYPES_UNITES) ;
+- pertes_totales : coût total des pertes des attaquants ;
+- defenseur : Armee du défenseur après la dernière vague.
+"""
+
+
+def _armee(joueur):
+    return joueur.copier() if isinstance(joueur, Armee) else Armee.depuis_joueur(joueur)
+
+
+class ChaineRaids:
+    """
+    Vagues d'attaque (Joueur ou Armee) contre un défenseur (Joueur ou Armee).
+
+    Les armées sont copiées en Armee à la construction : les objets fournis ne sont
+    jamais modifiés, et les types d'unités combattent dans l'ordre de TYPES_UNITES.
+    `cout(pertes)` donne le coût des pertes d'une vague (par défaut le nombre d'unités
+    perdues) ; il sert à comparer les ordres. Avec `entier`, les combats sont calculés
+    en entiers exacts (voir combat).
+    """
+
+    def __init__(self, vagues, defenseur, environment="terrain", rapide=False, cout=sum, entier=False):
+        if environment not in ENVIRONNEMENTS:
+            raise ValueError(f"Environnement inconnu : '{environment}'")
+        self.vagues = [_armee(vague) for vague in vagues]
+        self.defenseur = _armee(defenseur)
+        self.environment = environment
+        self.rapide = rapide
+        self.cout = cout
+        self.entier = entier
+        # Pour chaque vague, l'indice de la première vague identique (effectifs et bonus)
+        premieres = {}
+        self.classes = tuple(
+            premieres.setdefault((vague.tobytes(), vague.typecode, vague.mandibule, vague.carapace,
+                                  vague.dome, vague.loge), i)
+            for i, vague in enumerate(self.vagues)
+        )
+        prechauffer_stats(self.defenseur, *self.vagues)
+
+    def vague(self, i, defenseur, detail=DETAIL_ISSUE):
+        """
+        Joue la vague `i` contre `defenseur`, modifié sur place.
+        Retourne le rapport et les pertes de la vague par type d'unité.
+        """
+        attaquant = self.vagues[i].copier()
+        rapport = combat(attaquant, defenseur, self.environment, self.rapide, detail, entier=self.entier)
+        pertes = [avant - apres for avant, apres in zip(self.vagues[i], attaquant)]
+        return rapport, pertes
+
+    def simuler(self, ordre=None, detail=DETAIL_ISSUE):
+        """Joue les vagues dans `ordre` (par défaut l'ordre donné) et retourne un ResultatChaine."""
+        ordre = tuple(range(len(self.vagues)) if ordre is None else ordre)
+        if sorted(ordre) != list(range(len(self.vagues))):
+            raise ValueError(f"Ordre invalide : {ordre}")
+        defenseur = self.defenseur.copier()
+        rapports = []
+        pertes = []
+        for i in ordre:
+            rapport, pertes_vague = self.vague(i, defenseur, detail)
+            rapports.append(rapport)
+            pertes.append(pertes_vague)
+        return ResultatChaine(ordre, rapports, pertes, sum(self.cout(p) for p in pertes), defenseur)
+
+    def ordres(self):
+        """Tous les ordres distincts : des vagues identiques ne sont pas permutées entre elles."""
+        return [self._indices(classes) for classes in sorted(set(itertools.permutations(self.classes)))]
+
+    def evaluer(self, ordres=None):
+        """
+        Retourne {ordre: coût total des pertes} pour chaque ordre (par défaut tous).
+        Les préfixes communs ne sont joués qu'une fois : l'état du défenseur après
+        chaque préfixe est sauvegardé puis restauré pour les ordres suivants.
+        """
+        if ordres is None:
+            ordres = self.ordres()
+        etats = {(): (self.defenseur, 0)}
+        couts = {}
+        for ordre in ordres:
+            ordre = tuple(ordre)
+            for k in range(1, len(ordre) + 1):
+                if ordre[:k] not in etats:
+                    defenseur, cout = etats[ordre[:k - 1]]
+                    defenseur = defenseur.copier()
+                    _, pertes = self.vague(ordre[k - 1], defenseur)
+                    etats[ordre[:k]] = (defenseur, cout + self.cout(pertes))
+            couts[ordre] = etats[ordre][1]
+        return couts
+
+    def ordre_optimal(self, detail=DETAIL_ISSUE):
+        """
+        Cherche l'ordre des vagues qui minimise le coût total des pertes des attaquants
+        et retourne son ResultatChaine (à égalité, le premier ordre dans l'ordre lexicographique).
+
+        Jusqu'à VAGUES_MAX_EXHAUSTIF vagues, tous les ordres sont évalués ; deux préfixes
+        qui laissent le défenseur dans le même état partagent la suite du calcul.
+        Au-delà, chaque vague est choisie à son tour comme celle qui perd le moins
+        contre l'état courant du défenseur (sans garantie d'optimalité).
+        """
+        if len(self.vagues) <= VAGUES_MAX_EXHAUSTIF:
+            _, ordre = self._meilleure_suite(frozenset(range(len(self.vagues))), self.defenseur, {})
+        else:
+            ordre = self._ordre_glouton()
+        return self.simuler(ordre, detail)
+
+    def _indices(self, classes):
+        """Convertit un ordre de classes de vagues identiques en ordre d'indices de vagues."""
+        restantes = {}
+        for i, classe in enumerate(self.classes):
+            restantes.setdefault(classe, []).append(i)
+        return tuple(restantes[classe].pop(0) for classe in classes)
+
+    def _meilleure_suite(self, restantes, defenseur, memo):
+        """(coût minimal, ordre) pour jouer les vagues `restantes` contre `defenseur`."""
+        if not restantes:
+            return 0, ()
+        cle = (restantes, defenseur.tobytes(), defenseur.typecode)
+        if cle in memo:
+            return memo[cle]
+        meilleur = None
+        vues = set()
+        for i in sorted(restantes):
+            classe = self.classes[i]
+            if classe in vues:
+                continue  # une vague identique a déjà été essayée à cette place
+            vues.add(classe)
+            suivant = defenseur.copier()
+            _, pertes = self.vague(i, suivant)
+            cout, suite = self._meilleure_suite(restantes - {i}, suivant, memo)
+            cout += self.cout(pertes)
+            if meilleur is None or cout < meilleur[0]:
+                meilleur = (cout, (i,) + suite)
+        memo[cle] = meilleur
+        return meilleur
+
+    def _ordre_glouton(self):
+        restantes = list(range(len(self.vagues)))
+        defenseur = self.defenseur.copier()
+        ordre = []
+        while restantes:
+            choix = None
+            for i in restantes:
+                suivant = defenseur.copier()
+                _, pertes = self.vague(i, suivant)
+                if choix is None or self.cout(pertes) < choix[0]:
+                    choix = (self.cout(pertes), i, suivant)
+            _, i, defenseur = choix
+            ordre.append(i)
+            restantes.remove(i)
+        return tuple(ordre)
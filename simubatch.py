@@ -0,0 +1,292 @@
+"""Simulation vectorisée de milliers de combats en un seul appel (NumPy)."""
+
+from collections import namedtuple
+
+import numpy as np
+
+from simucombats import ENVIRONNEMENTS, NOMBRE_TOURS_MAX, TYPES_UNITES, UNITES_BASE, Armee, calcul_pertes
+
+
+# Codes d'issue renvoyés par simuler_lot
+ISSUE_LIMITE = 0  # les NOMBRE_TOURS_MAX tours se sont écoulés sans vainqueur
+ISSUE_VICTOIRE = 1  # toutes les unités du défenseur ont été détruites
+ISSUE_DEFAITE = 2  # toutes les unités de l'attaquant ont été détruites
+ISSUE_NUL = 3  # toutes les unités des deux joueurs ont été détruites
+ISSUES = ("limite", "victoire", "defaite", "nul")
+
+# En dessous de ce nombre de lignes douteuses, calcul_pertes est plus rapide que _pertes_lot
+_SEUIL_VECTORISATION = 500
+
+ResultatLot = namedtuple("ResultatLot", ["attaquants", "defenseurs", "tours", "issues"])
+
+_VIE_BASE = np.array([unit.health for unit in UNITES_BASE], dtype=np.float64)[:, None]
+_ATTAQUE_BASE = np.array([unit.attack for unit in UNITES_BASE], dtype=np.float64)[:, None]
+_DEFENSE_BASE = np.array([unit.defense for unit in UNITES_BASE], dtype=np.float64)[:, None]
+
+
+def comptes_depuis_joueur(joueur):
+    """
+    Retourne le vecteur des quantités d'un joueur (Joueur ou Armee) dans l'ordre de TYPES_UNITES.
+    """
+    if isinstance(joueur, Armee):
+        return list(joueur)
+    comptes = [0] * len(TYPES_UNITES)
+    for unit_class, unit in joueur.units.items():
+        comptes[TYPES_UNITES.index(unit_class)] = unit.unit_count
+    return comptes
+
+
+def _comptes_lot(comptes, n):
+    """Normalise des quantités (N, 15) ou (15,) en un tableau (15, n) modifiable."""
+    return np.array(np.broadcast_to(comptes, (n, len(TYPES_UNITES))).T, order="C")
+
+
+def _bonus_lot(bonus, n):
+    """Normalise les niveaux (mandibule, carapace, dôme, loge) en un tableau (4, n)."""
+    return np.broadcast_to(bonus, (n, 4)).T
+
+
+def _environnements_lot(environments, n):
+    """Convertit les environnements en codes 0 (terrain), 1 (dôme) ou 2 (loge)."""
+    codes = np.array([ENVIRONNEMENTS.index(env) for env in environments], dtype=np.int8)
+    return np.broadcast_to(codes, (n,))
+
+
+def _bonus_vie(carapace, dome, loge, environments):
+    """Reproduit exactement le calcul flottant du bonus de vie de Unit.effective_stats."""
+    bonus = 1 + (carapace * 0.05)
+    bonus = np.where(environments == 1, (bonus + (dome * 0.025)) + 0.05, bonus)
+    bonus = np.where(environments == 2, (bonus + (loge * 0.05)) + 0.10, bonus)
+    return bonus
+
+
+def _somme(stats, comptes, types):
+    """
+    Somme les stats des unités vivantes dans le même ordre que calcul_stat.
+    Une unité absente ajoute 0.0, ce qui ne change pas le total flottant.
+    """
+    total = np.zeros(comptes.shape[1], dtype=np.float64)
+    for i in types:
+        total += stats[i] * comptes[i]
+    return total
+
+
+def _pertes_lot(degats, vie, comptes):
+    """
+    Version vectorisée de calcul_pertes : même résultat ligne par ligne.
+    Retourne le nombre de morts et les dégâts restants.
+    """
+    morts = np.zeros(len(comptes), dtype=np.int64)
+    degats = degats.copy()
+    actives = (degats > 0) & (comptes > 0)
+    termines = np.zeros(len(comptes), dtype=bool)
+    while True:
+        idx = np.flatnonzero(actives & ~termines & (morts < comptes) & (degats >= vie))
+        if len(idx) == 0:
+            break
+        d = degats[idx]
+        v = vie[idx]
+        ulp = np.spacing(d)
+        mantisse = (d / ulp).astype(np.int64)
+        quotient = v / ulp
+        plancher = np.floor(quotient)
+        pas = np.rint(quotient).astype(np.int64)
+        egalite = (quotient - plancher) == 0.5
+        pas_pair = plancher.astype(np.int64)
+        pas_pair += pas_pair % 2
+        pas = np.where(egalite, np.where(mantisse % 2 == 1, -1, pas_pair), pas)
+
+        # La vie est sous la précision des dégâts : toutes les unités meurent
+        nuls = pas == 0
+        morts[idx[nuls]] = comptes[idx[nuls]]
+        termines[idx[nuls]] = True
+
+        marge = mantisse - (1 << 52) - np.ceil(quotient).astype(np.int64)
+        restantes = comptes[idx] - morts[idx]
+        sauts = np.where(
+            (pas > 0) & (marge >= 0),
+            np.minimum(marge // np.maximum(pas, 1) + 1, restantes),
+            0,
+        )
+        sauts[nuls] = 0
+        continues = ~nuls
+        rapides = continues & (sauts > 0)
+        lentes = continues & (sauts == 0)
+        degats[idx[rapides]] = (mantisse[rapides] - sauts[rapides] * pas[rapides]) * ulp[rapides]
+        morts[idx[rapides]] += sauts[rapides]
+        degats[idx[lentes]] = d[lentes] - v[lentes]
+        morts[idx[lentes]] += 1
+    survivantes = actives & (morts < comptes)
+    degats[survivantes] = 0
+    return morts, degats
+
+
+def _appliquer_pertes(comptes, degats, vies, types, vie_totale):
+    """
+    Applique les dégâts type par type, dans l'ordre canonique, comme appliquer_degats.
+
+    Les dégâts restants sont suivis avec une borne d'erreur : la boucle flottante de
+    calcul_pertes s'écarte du calcul exact d'au plus un demi-ulp par unité tuée. Tant
+    que le nombre de morts ne dépend pas de la valeur exacte dans cet intervalle, le
+    quotient suffit. Les lignes douteuses sont rejouées exactement.
+    `vie_totale` est la somme des vies de l'armée, calculée comme par calcul_stat.
+    """
+    # Armée écrasée : les dégâts dépassent sa vie totale de plus que l'erreur possible
+    marge = (comptes.sum(axis=0, dtype=np.float64) + 4 * len(comptes)) * np.spacing(degats)
+    ecrasees = degats - vie_totale >= marge
+    comptes[:, ecrasees] = 0
+
+    debut_comptes = comptes.copy()
+    debut_degats = degats
+    degats = np.where(ecrasees, 0, degats)
+    erreur = np.zeros(len(degats), dtype=np.float64)
+    douteuses = np.zeros(len(degats), dtype=bool)
+    for i in types:
+        idx = np.flatnonzero((comptes[i] > 0) & (degats > 0) & ~douteuses)
+        if len(idx) == 0:
+            continue
+        d = degats[idx]
+        e = erreur[idx]
+        v = vies[i, idx]
+        c = comptes[i, idx]
+        haut = d + e
+        bas = d - e
+
+        # Chaque soustraction de la boucle s'écarte du calcul exact d'au plus la
+        # distance entre `vie` et la grille de l'ulp des dégâts (nulle si `vie` en
+        # est un multiple : la boucle est alors exacte).
+        ulp = np.spacing(haut)
+        ecart = np.abs(v - np.rint(v / ulp) * ulp)
+        exactes = (e == 0) & (ecart == 0)
+        arrondi = np.where(exactes, 0, 4 * ulp)
+
+        # Dégâts trop faibles pour tuer une unité : ils sont perdus
+        perdus = haut < v
+
+        # Il reste des survivantes : le reste des dégâts est perdu
+        estimation = np.floor(d / v)
+        marge = estimation * ecart + arrondi
+        partielles = (
+            ~perdus
+            & (estimation < c)
+            & (bas - estimation * v >= marge)
+            & (haut - estimation * v < v - marge)
+        )
+        comptes[i, idx[partielles]] = c[partielles] - estimation[partielles].astype(np.int64)
+
+        # Toutes les unités meurent : le reste des dégâts passe au type suivant
+        marge = c * ecart + arrondi
+        totales = ~perdus & ~partielles & (bas - c * v >= marge)
+        comptes[i, idx[totales]] = 0
+        degats[idx[totales]] = d[totales] - c[totales] * v[totales]
+        erreur[idx[totales]] = e[totales] + marge[totales]
+
+        finies = perdus | partielles
+        degats[idx[finies]] = 0
+        erreur[idx[finies]] = 0
+        douteuses[idx[~(finies | totales)]] = True
+
+    # Lignes douteuses : on rejoue la boucle exactement depuis le début
+    lignes = np.flatnonzero(douteuses)
+    if len(lignes) > _SEUIL_VECTORISATION:
+        d = debut_degats[lignes]
+        for i in types:
+            restantes = debut_comptes[i, lignes]
+            morts, d = _pertes_lot(d, vies[i, lignes], restantes)
+            comptes[i, lignes] = restantes - morts
+    else:
+        # Peu de lignes : la version scalaire évite le surcoût de NumPy
+        for ligne in lignes.tolist():
+            d = float(debut_degats[ligne])
+            for i in types.tolist():
+                restantes = int(debut_comptes[i, ligne])
+                morts, d = calcul_pertes(d, float(vies[i, ligne]), restantes)
+                comptes[i, ligne] = restantes - morts
+
+
+def simuler_lot(attaquants, defenseurs, bonus_attaquants=(0, 0, 0, 0), bonus_defenseurs=(0, 0, 0, 0),
+                environments="terrain"):
+    """
+    Simule N combats en parallèle.
+
+    - attaquants, defenseurs : quantités de forme (N, 15) ou (15,), dans l'ordre de TYPES_UNITES.
+    - bonus_attaquants, bonus_defenseurs : niveaux (mandibule, carapace, dôme, loge),
+      de forme (N, 4) ou (4,).
+    - environments : un environnement ou une liste de N environnements.
+
+    Chaque ligne donne exactement le même résultat que `combat` avec des joueurs dont
+    les unités sont ajoutées dans l'ordre de TYPES_UNITES.
+    Retourne les quantités finales (N, 15), le nombre de tours et le code d'issue de
+    chaque combat.
+    """
+    attaquants = np.atleast_2d(np.asarray(attaquants, dtype=np.int64))
+    defenseurs = np.atleast_2d(np.asarray(defenseurs, dtype=np.int64))
+    bonus_attaquants = np.atleast_2d(np.asarray(bonus_attaquants, dtype=np.int64))
+    bonus_defenseurs = np.atleast_2d(np.asarray(bonus_defenseurs, dtype=np.int64))
+    if isinstance(environments, str):
+        environments = [environments]
+    n = max(len(attaquants), len(defenseurs), len(bonus_attaquants), len(bonus_defenseurs), len(environments))
+
+    final_att = _comptes_lot(attaquants, n)
+    final_def = _comptes_lot(defenseurs, n)
+    bonus_att = _bonus_lot(bonus_attaquants, n)
+    bonus_def = _bonus_lot(bonus_defenseurs, n)
+    envs = _environnements_lot(environments, n)
+    sans_env = np.zeros(n, dtype=np.int8)
+
+    # Statistiques effectives (15, n), calculées une seule fois pour tout le combat
+    attaque_att = _ATTAQUE_BASE * (1 + (bonus_att[0] * 0.05))
+    defense_def = _DEFENSE_BASE * (1 + (bonus_def[0] * 0.05))
+    vie_def = _VIE_BASE * _bonus_vie(bonus_def[1], bonus_def[2], bonus_def[3], envs)
+    # Les pertes de l'attaquant utilisent les bonus du défenseur, sans environnement
+    vie_pertes_att = _VIE_BASE * _bonus_vie(bonus_def[1], bonus_def[2], bonus_def[3], sans_env)
+
+    tours = np.full(n, NOMBRE_TOURS_MAX, dtype=np.int64)
+    issues = np.full(n, ISSUE_LIMITE, dtype=np.int8)
+
+    # Les tableaux de travail ne gardent que les combats encore en cours
+    en_cours = np.arange(n)
+    att = final_att.copy()
+    dfn = final_def.copy()
+    for tour in range(1, NOMBRE_TOURS_MAX + 1):
+        types_att = np.flatnonzero(att.any(axis=1))
+        types_def = np.flatnonzero(dfn.any(axis=1))
+        degats_attaquant = _somme(attaque_att, att, types_att)
+        degats_defenseur = _somme(defense_def, dfn, types_def)
+        vie_defenseur = _somme(vie_def, dfn, types_def)
+
+        trop_forte = degats_attaquant >= vie_defenseur
+        degats_defenseur[trop_forte] /= 2
+
+        _appliquer_pertes(dfn, degats_attaquant, vie_def, types_def, vie_defenseur)
+        vie_pertes_attaquant = _somme(vie_pertes_att, att, types_att)
+        _appliquer_pertes(att, degats_defenseur, vie_pertes_att, types_att, vie_pertes_attaquant)
+
+        def_detruit = ~dfn.any(axis=0)
+        att_detruit = ~att.any(axis=0)
+        finis = def_detruit | att_detruit
+        issues[en_cours[def_detruit & att_detruit]] = ISSUE_NUL
+        issues[en_cours[def_detruit & ~att_detruit]] = ISSUE_VICTOIRE
+        issues[en_cours[~def_detruit & att_detruit]] = ISSUE_DEFAITE
+        if tour == NOMBRE_TOURS_MAX:
+            finis[:] = True
+        if not finis.any():
+            continue
+
+        lignes = en_cours[finis]
+        final_att[:, lignes] = att[:, finis]
+        final_def[:, lignes] = dfn[:, finis]
+        tours[lignes] = tour
+
+        restants = ~finis
+        if not restants.any():
+            break
+        en_cours = en_cours[restants]
+        att = att[:, restants]
+        dfn = dfn[:, restants]
+        attaque_att = attaque_att[:, restants]
+        defense_def = defense_def[:, restants]
+        vie_def = vie_def[:, restants]
+        vie_pertes_att = vie_pertes_att[:, restants]
+
+    return ResultatLot(final_att.T, final_def.T, tours, issues)
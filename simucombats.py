@@ -1,8 +1,86 @@
+import functools
+import math
 import re
+import time
+from array import array
+from collections import namedtuple
+
+
+# Index des statistiques dans les tuples renvoyés par table_stats
+INDICES_STATS = {"health": 0, "attack": 1, "defense": 2}
+
+ENVIRONNEMENTS = ("terrain", "dome", "loge")
+
+# Mode entier : statistiques effectives en millièmes de point, exactes (tous les bonus
+# sont des multiples de 2,5 %)
+ECHELLE = 1000
+
+# Instrumentation du moteur (un objet mesures.Mesures), None quand elle est désactivée
+_mesures = None
+
+
+def activer_mesures(mesures):
+    """
+    Active l'instrumentation : durées par phase (analyse, statistiques, pertes, rendu),
+    tours simulés, unités tuées et durée des combats par forme d'armée.
+    `None` la désactive ; le moteur ne fait alors qu'un test par combat.
+    """
+    global _mesures
+    _mesures = mesures
+
+
+@functools.lru_cache(maxsize=8192)
+def table_stats(health, attack, defense, mandibule_lvl, carapace_lvl, dome_lvl, loge_lvl, environment):
+    """
+    Table mémoïsée des statistiques effectives (vie, attaque, défense) d'un type d'unité,
+    identifié par ses statistiques de base, pour des niveaux de bonus et un environnement.
+    Un combat n'utilise qu'une poignée de combinaisons, calculées une seule fois.
+    """
+    # Bonus de base
+    attack_bonus = 1 + (mandibule_lvl * 0.05)
+    defense_bonus = 1 + (mandibule_lvl * 0.05)
+    health_bonus = 1 + (carapace_lvl * 0.05)
+
+    # Bonus spécifiques à l'environnement
+    if environment == "dome":
+        health_bonus += (dome_lvl * 0.025)  # 2.5% par niveau de dôme
+        health_bonus += 0.05  # +5% supplémentaire en attaque
+    elif environment == "loge":
+        health_bonus += (loge_lvl * 0.05)  # 5% par niveau de loge
+        health_bonus += 0.10  # +10% supplémentaire en attaque
+
+    # Calcul des statistiques effectives
+    return (health * health_bonus, attack * attack_bonus, defense * defense_bonus)
+
+
+@functools.lru_cache(maxsize=8192)
+def table_stats_entiers(health, attack, defense, mandibule_lvl, carapace_lvl, dome_lvl, loge_lvl, environment):
+    """
+    Comme table_stats, en entiers exacts : statistiques effectives en millièmes (ECHELLE).
+    Les bonus sont les mêmes, comptés en millièmes : 5 % par niveau devient 50.
+    """
+    attack_bonus = ECHELLE + mandibule_lvl * 50
+    defense_bonus = ECHELLE + mandibule_lvl * 50
+    health_bonus = ECHELLE + carapace_lvl * 50
+
+    if environment == "dome":
+        health_bonus += dome_lvl * 25 + 50
+    elif environment == "loge":
+        health_bonus += loge_lvl * 50 + 100
+
+    return (health * health_bonus, attack * attack_bonus, defense * defense_bonus)
+
+
+def _format_milliemes(valeur):
+    """Valeur entière en millièmes écrite en décimal exact : 1234500 -> "1234.5"."""
+    entier, reste = divmod(valeur, ECHELLE)
+    return f"{entier}.{f'{reste:03d}'.rstrip('0') or '0'}"
 
 
 class Unit:
     """Classe de base pour toutes les unités de combat."""
+    __slots__ = ("name", "level", "health", "attack", "defense", "unit_count")
+
     def __init__(self, name, level, health, attack, defense, unit_count=0):
         self.name = name
         self.level = level
@@ -20,30 +98,23 @@ class Unit:
         - "loge" : bonus de loge actif.
         - "terrain" : aucun bonus.
         """
-        # Bonus de base
-        attack_bonus = 1 + (mandibule_lvl * 0.05)
-        defense_bonus = 1 + (mandibule_lvl * 0.05)
-        health_bonus = 1 + (carapace_lvl * 0.05)
-
-        # Bonus spécifiques à l'environnement
-        if environment == "dome":
-            health_bonus += (dome_lvl * 0.025)  # 2.5% par niveau de dôme
-            health_bonus += 0.05  # +5% supplémentaire en attaque
-        elif environment == "loge":
-            health_bonus += (loge_lvl * 0.05)  # 5% par niveau de loge
-            health_bonus += 0.10  # +10% supplémentaire en attaque
-
-        # Calcul des statistiques effectives
-        effective_health = self.health * health_bonus
-        effective_attack = self.attack * attack_bonus
-        effective_defense = self.defense * defense_bonus
-
+        effective_health, effective_attack, effective_defense = table_stats(
+            self.health, self.attack, self.defense,
+            mandibule_lvl, carapace_lvl, dome_lvl, loge_lvl, environment
+        )
         return {
             "health": effective_health,
             "attack": effective_attack,
             "defense": effective_defense
         }
 
+    def stats_table(self, joueur, environment):
+        """Statistiques effectives (vie, attaque, défense) avec les bonus d'un joueur, depuis la table."""
+        return table_stats(
+            self.health, self.attack, self.defense,
+            joueur.mandibule, joueur.carapace, joueur.dome, joueur.loge, environment
+        )
+
     def __repr__(self):
         return (f"{self.name} (Niveau {self.level}) : Vie={self.health}, "
                 f"Attaque={self.attack}, Défense={self.defense}, "
@@ -52,80 +123,214 @@ class Unit:
 
 # Définition des classes d'unités spécifiques
 class Esclave(Unit):
+    __slots__ = ()
+
     def __init__(self, unit_count=0):
         super().__init__("Esclave", 1, 4, 4, 3, unit_count)
 
 
 class MaitreEsclave(Unit):
+    __slots__ = ()
+
     def __init__(self, unit_count=0):
         super().__init__("Maître esclave", 2, 6, 6, 4, unit_count)
 
 
 class JeuneSoldate(Unit):
+    __slots__ = ()
+
     def __init__(self, unit_count=0):
         super().__init__("Jeune soldate", 1, 16, 8, 7, unit_count)
 
 
 class Soldate(Unit):
+    __slots__ = ()
+
     def __init__(self, unit_count=0):
         super().__init__("Soldate", 2, 20, 11, 10, unit_count)
 
 
 class SoldateElite(Unit):
+    __slots__ = ()
+
     def __init__(self, unit_count=0):
         super().__init__("Soldate d'élite", 3, 26, 17, 14, unit_count)
 
 
 class Gardienne(Unit):
+    __slots__ = ()
+
     def __init__(self, unit_count=0):
         super().__init__("Gardienne", 1, 25, 1, 27, unit_count)
 
 
 class GardienneElite(Unit):
+    __slots__ = ()
+
     def __init__(self, unit_count=0):
         super().__init__("Gardienne d'élite", 2, 32, 1, 35, unit_count)
 
 
 class Tirailleuse(Unit):
+    __slots__ = ()
+
     def __init__(self, unit_count=0):
         super().__init__("Tirailleuse", 1, 12, 32, 10, unit_count)
 
 
 class TirailleuseElite(Unit):
+    __slots__ = ()
+
     def __init__(self, unit_count=0):
         super().__init__("Tirailleuse d'élite", 2, 15, 40, 12, unit_count)
 
 
 class JeuneLegionnaire(Unit):
+    __slots__ = ()
+
     def __init__(self, unit_count=0):
         super().__init__("Jeune légionnaire", 1, 40, 45, 35, unit_count)
 
 
 class Legionnaire(Unit):
+    __slots__ = ()
+
     def __init__(self, unit_count=0):
         super().__init__("Légionnaire", 2, 55, 60, 45, unit_count)
 
 
 class LegionnaireElite(Unit):
+    __slots__ = ()
+
     def __init__(self, unit_count=0):
         super().__init__("Légionnaire d'élite", 3, 60, 65, 50, unit_count)
 
 
 class JeuneTank(Unit):
+    __slots__ = ()
+
     def __init__(self, unit_count=0):
         super().__init__("Jeune tank", 1, 40, 80, 1, unit_count)
 
 
 class Tank(Unit):
+    __slots__ = ()
+
     def __init__(self, unit_count=0):
         super().__init__("Tank", 2, 70, 140, 1, unit_count)
 
 
 class TankElite(Unit):
+    __slots__ = ()
+
     def __init__(self, unit_count=0):
         super().__init__("Tank d'élite", 3, 80, 160, 1, unit_count)
 
 
+# Ordre canonique des types d'unités (utilisé par les moteurs vectorisés)
+TYPES_UNITES = (
+    Esclave,
+    MaitreEsclave,
+    JeuneSoldate,
+    Soldate,
+    SoldateElite,
+    Gardienne,
+    GardienneElite,
+    Tirailleuse,
+    TirailleuseElite,
+    JeuneLegionnaire,
+    Legionnaire,
+    LegionnaireElite,
+    JeuneTank,
+    Tank,
+    TankElite,
+)
+
+# Une unité de chaque type : statistiques de base partagées par toutes les armées compactes
+UNITES_BASE = tuple(unit_class() for unit_class in TYPES_UNITES)
+_INDICES_TYPES = {unit_class: i for i, unit_class in enumerate(TYPES_UNITES)}
+
+
+def _pluriel(nom):
+    """Met au pluriel les mots d'un nom d'unité situés avant « d'élite »."""
+    tete, sep, queue = nom.partition(" d'")
+    mots = [mot if mot.endswith("s") else mot + "s" for mot in tete.split(" ")]
+    return " ".join(mots) + sep + queue
+
+
+def _cle_nom(nom):
+    """Forme normalisée d'un nom d'unité : casse, apostrophes et espaces ignorés."""
+    return " ".join(nom.replace("’", "'").replace("' ", "'").casefold().split())
+
+
+# Table des noms d'unités (singulier et pluriel) vers leurs classes, construite une seule fois.
+# Les clés sont normalisées par _cle_nom ; elle n'est jamais modifiée ensuite.
+NOMS_UNITES = {}
+for _unit_class in TYPES_UNITES:
+    _nom = _unit_class().name
+    NOMS_UNITES[_cle_nom(_nom)] = _unit_class
+    NOMS_UNITES[_cle_nom(_pluriel(_nom))] = _unit_class
+del _unit_class, _nom
+
+# Une entrée d'armée : quantité (chiffres groupés par des espaces), un ou plusieurs blancs,
+# puis nom de l'unité, fait de lettres séparées par des espaces ou des apostrophes ;
+# la ponctuation qui suit (virgule, point, parenthèse, barre oblique...) n'en fait pas partie
+_MOTIF_ENTREE = re.compile(r"(\d[\d ]*?)\s+([^\W\d_]+(?:[ \t'’]+[^\W\d_]+)*)")
+# Espaces insécables des grands nombres copiés depuis le jeu
+_INSECABLES = str.maketrans({"\u00a0": " ", "\u202f": " "})
+
+
+@functools.lru_cache(maxsize=1024)
+def _classe_nom(nom):
+    """
+    Classe d'unité d'un nom brut, ou None. Les formes déjà vues sont gardées dans un cache
+    borné : un texte soumis par un utilisateur ne peut pas faire grossir la mémoire.
+    """
+    return NOMS_UNITES.get(_cle_nom(nom))
+
+
+def _classe_unite(nom, numero=None):
+    """Classe d'unité d'un nom extrait du texte ; ValueError si le nom est inconnu."""
+    unit_class = _classe_nom(nom)
+    if unit_class is None:
+        prefixe = f"Texte {numero} : u" if numero else "U"
+        raise ValueError(f"{prefixe}nité non reconnue : '{nom.strip()}'")
+    return unit_class
+
+
+def analyser_armee(texte):
+    """
+    Analyse un texte d'armée (« 1 000 Tanks, 500 Légionnaires d'élite ») en une seule passe.
+    Les entrées sont séparées par des virgules ou des retours à la ligne ; les noms sont
+    acceptés au singulier comme au pluriel.
+    Retourne la liste des couples (classe d'unité, quantité) dans l'ordre du texte.
+    """
+    if "\u00a0" in texte or "\u202f" in texte:
+        texte = texte.translate(_INSECABLES)
+    return [(_classe_nom(nom) or _classe_unite(nom), int(quantite.replace(" ", "")))
+            for quantite, nom in _MOTIF_ENTREE.findall(texte)]
+
+
+def analyser_armees(textes):
+    """
+    Analyse en masse des textes d'armée (par exemple les lignes d'un fichier exporté).
+    Retourne une liste de listes de couples (classe d'unité, quantité), une par texte.
+    Une unité inconnue lève une ValueError indiquant le numéro du texte fautif.
+    """
+    trouver = _MOTIF_ENTREE.findall
+    classe_nom = _classe_nom
+    armees = []
+    for numero, texte in enumerate(textes, 1):
+        if "\u00a0" in texte or "\u202f" in texte:
+            texte = texte.translate(_INSECABLES)
+        unites = []
+        for quantite, nom in trouver(texte):
+            unit_class = classe_nom(nom) or _classe_unite(nom, numero)
+            unites.append((unit_class, int(quantite.replace(" ", ""))))
+        armees.append(unites)
+    return armees
+
+
 class Joueur:
     """Classe représentant un joueur avec des unités et des ressources."""
     def __init__(self, name):
@@ -152,41 +357,27 @@ class Joueur:
         Analyse le texte pour extraire les unités et leurs quantités.
         Gère les grands nombres avec espaces comme séparateurs.
         """
-        import re
-
-        # Regex pour capturer les quantités et noms des unités
-        pattern = r"([\d\s]+)\s+([\w\s'êé]+),?"
-        matches = re.findall(pattern, texte)
-
-        # Mapping des noms d'unités aux classes
-        unit_map = {
-            "Esclaves": Esclave,
-            "Maîtres esclaves": MaitreEsclave,
-            "Jeunes soldates": JeuneSoldate,
-            "Soldates": Soldate,
-            "Soldates d'élite": SoldateElite,
-            "Gardiennes": Gardienne,
-            "Gardiennes d'élite": GardienneElite,
-            "Tirailleuses": Tirailleuse,
-            "Tirailleuses d'élite": TirailleuseElite,
-            "Jeunes légionnaires": JeuneLegionnaire,
-            "Légionnaires": Legionnaire,
-            "Jeunes tanks": JeuneTank,
-            "Tanks": Tank,
-        }
-
-        # Parcours des correspondances
-        for match in matches:
-            # Nettoyage et conversion de la quantité
-            quantity = int(match[0].replace(" ", ""))
-            # Nettoyage du nom de l'unité
-            unit_name = match[1].strip()
-            # Ajout ou mise à jour de l'unité si reconnue
-            if unit_name in unit_map:
-                self.ajouter_unite(unit_map[unit_name], quantity)
-            else:
-                raise ValueError(f"Unité non reconnue : '{unit_name}'")
-
+        mesures = _mesures
+        if mesures is not None:
+            debut = time.perf_counter()
+        for unit_class, quantity in analyser_armee(texte):
+            self.ajouter_unite(unit_class, quantity)
+        if mesures is not None:
+            mesures.compter("simu_phase_secondes_total", time.perf_counter() - debut, phase="analyse")
+
+    def copier(self):
+        """
+        Retourne une copie indépendante du joueur (unités et bonus), dans le même ordre.
+        Un combat sur la copie ne modifie pas le joueur d'origine.
+        """
+        copie = Joueur(self.name)
+        for unit_class, unit in self.units.items():
+            copie.ajouter_unite(unit_class, unit.unit_count)
+        copie.mandibule = self.mandibule
+        copie.carapace = self.carapace
+        copie.dome = self.dome
+        copie.loge = self.loge
+        return copie
 
     def stats_effectives(self, environment="terrain"):
         """
@@ -195,10 +386,8 @@ class Joueur:
         """
         resultats = {}
         for unit_class, unit in self.units.items():
-            stats = unit.effective_stats(
-                self.mandibule, self.carapace, self.dome, self.loge, environment
-            )
-            resultats[unit.name] = stats
+            health, attack, defense = unit.stats_table(self, environment)
+            resultats[unit.name] = {"health": health, "attack": attack, "defense": defense}
         return resultats
 
     def __repr__(self):
@@ -212,272 +401,606 @@ class Joueur:
                 f"Unités :\n{units_repr}")
 
 
+class Armee(array):
+    """
+    Armée compacte : un vecteur d'entiers donnant l'effectif de chaque type d'unité dans
+    l'ordre de TYPES_UNITES (armee[i]), plus le nom et les niveaux de bonus, sans objet
+    Unit. Les statistiques de base restent dans UNITES_BASE, partagé par toutes les armées.
+    Les effectifs tiennent sur 4 octets chacun tant qu'ils restent sous 2**32.
+    combat, calcul_stat, appliquer_degats et prechauffer_stats l'acceptent à la place
+    d'un Joueur ; seuls les types présents y participent, dans l'ordre de TYPES_UNITES.
+    """
+    __slots__ = ("name", "mandibule", "carapace", "dome", "loge")
+
+    def __new__(cls, name, comptes=None, mandibule=0, carapace=0, dome=0, loge=0):
+        if comptes is None:
+            comptes = _COMPTES_VIDES
+        elif len(comptes) != len(TYPES_UNITES):
+            raise ValueError(f"Une armée compte {len(TYPES_UNITES)} types d'unités, pas {len(comptes)}")
+        if isinstance(comptes, array):
+            typecode = comptes.typecode
+        else:
+            typecode = "I" if max(comptes) < 2**32 else "q"
+        return super().__new__(cls, typecode, comptes)
+
+    def __init__(self, name, comptes=None, mandibule=0, carapace=0, dome=0, loge=0):
+        self.name = name
+        self.mandibule = mandibule
+        self.carapace = carapace
+        self.dome = dome
+        self.loge = loge
+
+    @classmethod
+    def depuis_joueur(cls, joueur):
+        """Convertit un Joueur ; l'ordre de ses unités n'est pas conservé."""
+        comptes = [0] * len(TYPES_UNITES)
+        for unit_class, unit in joueur.units.items():
+            comptes[_INDICES_TYPES[unit_class]] = unit.unit_count
+        return cls(joueur.name, comptes, joueur.mandibule, joueur.carapace, joueur.dome, joueur.loge)
+
+    def vers_joueur(self):
+        """Convertit en Joueur, avec les types présents dans l'ordre de TYPES_UNITES."""
+        joueur = Joueur(self.name)
+        for unit_class, compte in zip(TYPES_UNITES, self):
+            if compte:
+                joueur.ajouter_unite(unit_class, compte)
+        joueur.mandibule = self.mandibule
+        joueur.carapace = self.carapace
+        joueur.dome = self.dome
+        joueur.loge = self.loge
+        return joueur
+
+    def copier(self):
+        return Armee(self.name, self, self.mandibule, self.carapace, self.dome, self.loge)
+
+    # array.__copy__ retournerait un simple array, sans le nom ni les bonus
+    def __copy__(self):
+        return self.copier()
+
+    def __deepcopy__(self, memo):
+        return self.copier()
+
+    def __eq__(self, autre):
+        if not isinstance(autre, Armee):
+            return NotImplemented
+        return (array.__eq__(self, autre) and self.name == autre.name
+                and (self.mandibule, self.carapace, self.dome, self.loge)
+                == (autre.mandibule, autre.carapace, autre.dome, autre.loge))
+
+    def __reduce_ex__(self, protocole):
+        return (Armee, (self.name, list(self), self.mandibule, self.carapace, self.dome, self.loge))
+
+    def __repr__(self):
+        unites = ", ".join(f"{unit.name} : {compte}" for unit, compte in zip(UNITES_BASE, self) if compte)
+        return (f"Armee({self.name!r}, {unites}, mandibule={self.mandibule}, "
+                f"carapace={self.carapace}, dome={self.dome}, loge={self.loge})")
+
+
+_COMPTES_VIDES = array("I", bytes(4 * len(TYPES_UNITES)))
+
+
+def _unites(joueur):
+    """Unités d'un Joueur, ou unités de base des types présents dans une Armee."""
+    if isinstance(joueur, Armee):
+        return [UNITES_BASE[i] for i, compte in enumerate(joueur) if compte > 0]
+    return list(joueur.units.values())
+
+
+def creer_joueur(name, donnees):
+    """
+    Construit un nouveau joueur à partir d'un dictionnaire :
+    {"armee": "<texte de l'armée>", "mandibule": 0, "carapace": 0, "dome": 0, "loge": 0}.
+    Les niveaux absents valent 0.
+    """
+    joueur = Joueur(name)
+    joueur.importer_unites_depuis_texte(donnees.get("armee", ""))
+    joueur.mandibule = int(donnees.get("mandibule", 0))
+    joueur.carapace = int(donnees.get("carapace", 0))
+    joueur.dome = int(donnees.get("dome", 0))
+    joueur.loge = int(donnees.get("loge", 0))
+    return joueur
+
+
+def prechauffer_stats(*joueurs):
+    """
+    Remplit la table des statistiques pour toutes les combinaisons utilisées par un combat
+    entre ces joueurs : chaque unité avec les bonus de chaque joueur (les pertes de
+    l'attaquant utilisent les bonus du défenseur), dans chaque environnement.
+    """
+    for unit in {unit.__class__: unit for joueur in joueurs for unit in _unites(joueur)}.values():
+        for joueur in joueurs:
+            for environment in (None,) + ENVIRONNEMENTS:
+                unit.stats_table(joueur, environment)
+
+
 def calcul_stat(joueur, stat, environment):
-    stats = 0
-    for unit_class, unit in joueur.units.items():
-        if unit.unit_count > 0:  # Ne compte que les unités encore vivantes
-            stats_ = unit.effective_stats(
-                joueur.mandibule,
-                joueur.carapace,
-                joueur.dome,
-                joueur.loge,
-                environment
-            )
-            stats_unit = stats_[stat] * unit.unit_count
-            stats += stats_unit
-    return stats
+    """Total d'une statistique des unités vivantes d'un Joueur ou d'une Armee."""
+    return EtatArmee(joueur, environment).total(stat)
+
+def calcul_pertes(degats, vie, unit_count):
+    """
+    Calcule le nombre d'unités tuées par une quantité de dégâts, sans boucler unité par unité.
+
+    Le résultat est identique à la boucle historique, qui retirait `vie` des dégâts
+    pour chaque unité tuée (y compris les arrondis flottants de ces soustractions
+    successives) et perdait le reste des dégâts s'il restait des survivantes.
+    Tant que les dégâts restent dans la même puissance de deux, chaque soustraction
+    retire exactement le même multiple de l'ulp : on saute donc directement à la
+    fin de cette plage. Le coût ne dépend plus du nombre d'unités tuées.
+
+    Retourne le nombre de morts et les dégâts qui passent au type d'unité suivant.
+    """
+    if degats <= 0 or unit_count <= 0:
+        return 0, degats
+    morts = 0
+    while morts < unit_count and degats >= vie:
+        ulp = math.ulp(degats)
+        mantisse = int(degats / ulp)  # entier dans [2**52, 2**53)
+        quotient = vie / ulp  # exact : division par une puissance de deux
+        pas = round(quotient)
+        if quotient - math.floor(quotient) == 0.5:
+            # Égalité d'arrondi : le résultat est arrondi vers une mantisse paire
+            if mantisse % 2:
+                pas = -1  # une soustraction normale rend la mantisse paire
+            else:
+                pas = math.floor(quotient)
+                pas += pas % 2
+        if pas == 0:
+            # La vie est sous la précision des dégâts : ils ne diminuent plus
+            return unit_count, degats
+        sauts = 0
+        if pas > 0:
+            # Nombre de soustractions dont le résultat reste dans la même plage
+            marge = mantisse - (1 << 52) - math.ceil(quotient)
+            if marge >= 0:
+                sauts = min(marge // pas + 1, unit_count - morts)
+        if sauts > 0:
+            degats = (mantisse - sauts * pas) * ulp
+            morts += sauts
+        else:
+            degats -= vie
+            morts += 1
+    if morts < unit_count:
+        # Il reste des survivantes : les dégâts restants sont perdus
+        return morts, 0
+    return morts, degats
+
+
+class EtatArmee:
+    """
+    État d'un Joueur ou d'une Armee pendant un combat : effectifs et totaux de vie,
+    attaque et défense dans un environnement donné, avec les bonus du joueur.
+
+    Chaque type d'unité garde son terme (statistique × effectif), mis à jour en O(1)
+    quand il subit des pertes. Un total n'est re-sommé que si l'un de ses termes a
+    changé, dans l'ordre de l'armée comme calcul_stat : une soustraction directe sur
+    le total accumulerait des arrondis et changerait les résultats.
+    Les effectifs ne sont reportés sur le joueur que par `enregistrer()`.
+    """
+
+    def __init__(self, joueur, environment):
+        self.joueur = joueur
+        self.nom = joueur.name
+        self.unites = _unites(joueur)
+        self.noms = [unit.name for unit in self.unites]
+        if isinstance(joueur, Armee):
+            self.types = [i for i, compte in enumerate(joueur) if compte > 0]
+            self.comptes = [joueur[i] for i in self.types]
+        else:
+            self.types = None
+            self.comptes = [unit.unit_count for unit in self.unites]
+        self.stats = self.stats_avec_bonus(joueur, environment)
+        self.termes = [[stats[index] * compte for stats, compte in zip(self.stats, self.comptes)]
+                       for index in range(3)]
+        self.totaux = [None, None, None]
+        self.vivantes = sum(1 for compte in self.comptes if compte > 0)
+
+    def stats_avec_bonus(self, joueur, environment):
+        """Statistiques effectives de chaque type de l'armée avec les bonus de `joueur`."""
+        return [
+            table_stats(unit.health, unit.attack, unit.defense,
+                        joueur.mandibule, joueur.carapace, joueur.dome, joueur.loge, environment)
+            for unit in self.unites
+        ]
+
+    def total(self, stat):
+        """Total d'une statistique ("health", "attack" ou "defense") des unités vivantes."""
+        index = INDICES_STATS[stat]
+        total = self.totaux[index]
+        if total is None:
+            total = sum([terme for terme, compte in zip(self.termes[index], self.comptes) if compte > 0])
+            self.totaux[index] = total
+        return total
+
+    def detruite(self):
+        return self.vivantes == 0
+
+    def subir(self, degats, vies=None):
+        """
+        Applique des dégâts type par type, comme appliquer_degats. `vies` remplace la vie
+        effective de chaque type (les pertes de l'attaquant utilisent les bonus du défenseur).
+        Retourne les pertes de chaque type d'unité.
+        """
+        if vies is None:
+            vies = [stats[0] for stats in self.stats]
+        pertes = []
+        for i, compte in enumerate(self.comptes):
+            morts, degats = calcul_pertes(degats, vies[i], compte)
+            if morts:
+                compte -= morts
+                self.comptes[i] = compte
+                stats = self.stats[i]
+                for index in range(3):
+                    self.termes[index][i] = stats[index] * compte
+                self.totaux = [None, None, None]
+                if compte == 0:
+                    self.vivantes -= 1
+            pertes.append(morts)
+        return pertes
+
+    def enregistrer(self):
+        """Reporte les effectifs sur le Joueur ou l'Armee d'origine."""
+        if self.types is None:
+            for unit, compte in zip(self.unites, self.comptes):
+                unit.unit_count = compte
+        else:
+            for i, compte in zip(self.types, self.comptes):
+                self.joueur[i] = compte
+
+
+class _EtatArmeeMesure(EtatArmee):
+    """EtatArmee qui chronomètre ses calculs et compte les pertes, quand l'instrumentation est active."""
+
+    def __init__(self, joueur, environment):
+        debut = time.perf_counter()
+        super().__init__(joueur, environment)
+        self.mesures = _mesures
+        self.mesures.compter("simu_phase_secondes_total", time.perf_counter() - debut, phase="statistiques")
+
+    def total(self, stat):
+        debut = time.perf_counter()
+        total = super().total(stat)
+        self.mesures.compter("simu_phase_secondes_total", time.perf_counter() - debut, phase="statistiques")
+        return total
+
+    def subir(self, degats, vies=None):
+        debut = time.perf_counter()
+        pertes = super().subir(degats, vies)
+        self.mesures.compter("simu_phase_secondes_total", time.perf_counter() - debut, phase="pertes")
+        self.mesures.compter("simu_unites_tuees_total", sum(pertes))
+        return pertes
+
+
+class EtatArmeeEntier(EtatArmee):
+    """
+    EtatArmee en arithmétique entière exacte (mode `entier` de combat) : statistiques en
+    millièmes (ECHELLE), pertes par division entière. Sans arrondi, les totaux sont tenus
+    à jour par simple soustraction et le résultat ne dépend ni de la machine ni de
+    l'ordre des additions.
+    """
+
+    def __init__(self, joueur, environment):
+        super().__init__(joueur, environment)
+        self.totaux = [sum(termes) for termes in self.termes]
+
+    def stats_avec_bonus(self, joueur, environment):
+        return [
+            table_stats_entiers(unit.health, unit.attack, unit.defense,
+                                joueur.mandibule, joueur.carapace, joueur.dome, joueur.loge, environment)
+            for unit in self.unites
+        ]
+
+    def total(self, stat):
+        return self.totaux[INDICES_STATS[stat]]
+
+    def subir(self, degats, vies=None):
+        """
+        Comme EtatArmee.subir : chaque unité tuée consomme sa vie en dégâts, le reste passe
+        au type suivant seulement si tout le type est détruit. Comme calcul_pertes, une vie
+        nulle ou négative (carapace très négative) ne protège aucune unité du type.
+        """
+        if vies is None:
+            vies = [stats[0] for stats in self.stats]
+        pertes = []
+        totaux = self.totaux
+        for i, compte in enumerate(self.comptes):
+            morts = 0
+            if degats > 0 and compte > 0:
+                morts = degats // vies[i] if vies[i] > 0 else compte
+                if morts < compte:
+                    degats = 0
+                else:
+                    morts = compte
+                    degats -= compte * vies[i]
+                    self.vivantes -= 1
+                if morts:
+                    self.comptes[i] = compte - morts
+                    stats = self.stats[i]
+                    totaux[0] -= stats[0] * morts
+                    totaux[1] -= stats[1] * morts
+                    totaux[2] -= stats[2] * morts
+            pertes.append(morts)
+        return pertes
+
+
+class _EtatArmeeEntierMesure(_EtatArmeeMesure, EtatArmeeEntier):
+    """EtatArmeeEntier instrumenté."""
+
 
 def appliquer_degats(attaquant, defenseur, degats_attaque_effectif, degats_defenseur_effectif, environment):
+    """
+    Applique les dégâts aux deux armées (Joueur ou Armee).
+    Retourne les pertes de chaque type d'unité (attaquant, défenseur), dans l'ordre des armées.
+    """
     # Appliquer les dégâts à l'armée du défenseur
-    for unit_class, unit in defenseur.units.items():
-        vie = unit.effective_stats(
-            defenseur.mandibule,
-            defenseur.carapace,
-            defenseur.dome,
-            defenseur.loge,
-            environment
-            )["health"]
-        while degats_attaque_effectif > 0 and unit.unit_count > 0:
-            if degats_attaque_effectif >= vie:
-                # Si les dégâts sont supérieurs à la vie de l'unité, on la tue
-                degats_attaque_effectif -= vie
-                unit.unit_count -= 1  # Une unité détruite
-            else:
-                degats_attaque_effectif = 0
-
-    # Appliquer les dégâts à l'armée de l'attaquant
-    for unit_class, unit in attaquant.units.items():
-        vie = unit.effective_stats(
-            defenseur.mandibule,
-            defenseur.carapace,
-            defenseur.dome,
-            defenseur.loge,
-            None
-            )["health"]
-        # Calculer combien d'unités doivent être éliminées
-        while degats_defenseur_effectif > 0 and unit.unit_count > 0:
-            if degats_defenseur_effectif >= vie:
-                # Si les dégâts sont supérieurs à la vie de l'unité, on la tue
-                degats_defenseur_effectif -= vie
-                unit.unit_count -= 1  # Une unité détruite
+    etat_defenseur = EtatArmee(defenseur, environment)
+    pertes_defenseur = etat_defenseur.subir(degats_attaque_effectif)
+    etat_defenseur.enregistrer()
+
+    # Appliquer les dégâts à l'armée de l'attaquant, avec la vie calculée selon les bonus du défenseur
+    etat_attaquant = EtatArmee(attaquant, None)
+    vies = [stats[0] for stats in etat_attaquant.stats_avec_bonus(defenseur, None)]
+    pertes_attaquant = etat_attaquant.subir(degats_defenseur_effectif, vies)
+    etat_attaquant.enregistrer()
+
+    return pertes_attaquant, pertes_defenseur
+
+
+# Niveaux de détail d'un rapport de combat
+DETAIL_ISSUE = "issue"  # état initial, état final et issue
+DETAIL_TOURS = "tours"  # plus les dégâts et la vie totale de chaque tour
+DETAIL_COMPLET = "complet"  # plus les pertes de chaque type d'unité à chaque tour
+DETAILS = (DETAIL_ISSUE, DETAIL_TOURS, DETAIL_COMPLET)
+
+NOMBRE_TOURS_MAX = 19
+
+# Un tour du combat ; les pertes sont None en dessous du détail complet
+Tour = namedtuple("Tour", [
+    "numero", "degats_attaquant", "vie_attaquant", "degats_defenseur", "vie_defenseur",
+    "attaque_trop_forte", "pertes_attaquant", "pertes_defenseur",
+])
+
+_MESSAGES_FIN = {
+    "nul": "Toutes les unités des deux joueurs ont été détruites. Match nul.",
+    "victoire": "Toutes les unités du defenseur ont été détruites. Fin du combat.",
+    "defaite": "Toutes les unités de l'attaquant ont été détruites. Fin du combat.",
+}
+
+
+class RapportCombat:
+    """
+    Journal structuré d'un combat : effectifs initiaux et finaux, tours joués et issue
+    ("victoire", "defaite", "nul" ou "limite"). Le texte n'est produit que sur demande,
+    par `lignes()` ; `vers_dict()` donne une forme compacte pour le JSON et `vers_deltas()`
+    une forme plus compacte encore, où seules les pertes non nulles de chaque tour figurent.
+    """
+
+    def __init__(self, attaquant, defenseur, environment, detail, echelle=1):
+        """
+        `attaquant` et `defenseur` sont les EtatArmee du combat, avant le premier tour.
+        `echelle` vaut ECHELLE en mode entier : dégâts et vies sont alors en millièmes.
+        """
+        self.environment = environment
+        self.detail = detail
+        self.echelle = echelle
+        self.noms = (attaquant.nom, defenseur.nom)
+        self.unites = (attaquant.noms, defenseur.noms)
+        self.initial = (tuple(attaquant.comptes), tuple(defenseur.comptes))
+        self.final = self.initial
+        self.tours = []
+        self.nombre_tours = 0
+        self.tours_sautes = 0
+        self.issue = "limite"
+
+    def lignes(self):
+        """Rapport texte, au niveau de détail enregistré."""
+        mesures = _mesures
+        if mesures is None:
+            return self._lignes()
+        debut = time.perf_counter()
+        lignes = self._lignes()
+        mesures.compter("simu_phase_secondes_total", time.perf_counter() - debut, phase="rendu")
+        return lignes
+
+    def _lignes(self):
+        valeur = str if self.echelle == 1 else _format_milliemes
+        lignes = []
+        self._ajouter_etat(lignes, self.initial, "unités")
+        comptes_att, comptes_def = list(self.initial[0]), list(self.initial[1])
+        for tour in self.tours:
+            lignes.append(f"\n=== Tour {tour.numero} ===")
+            lignes.append(f"Dégâts infligés par l'attaquant : {valeur(tour.degats_attaquant)}")
+            lignes.append(f"Vie de l'attaquant : {valeur(tour.vie_attaquant)}")
+            lignes.append(f"Dégâts infligés par le défenseur : {valeur(tour.degats_defenseur)}")
+            lignes.append(f"Vie du défenseur : {valeur(tour.vie_defenseur)}")
+            if tour.attaque_trop_forte:
+                lignes.append("Attaque trop forte degats de la defense divisé par 2.")
+            if tour.pertes_attaquant is not None:
+                for i, morts in enumerate(tour.pertes_attaquant):
+                    comptes_att[i] -= morts
+                for i, morts in enumerate(tour.pertes_defenseur):
+                    comptes_def[i] -= morts
+                self._ajouter_etat(lignes, (comptes_att, comptes_def), "unités restantes")
+        if self.detail != DETAIL_COMPLET:
+            lignes.append(f"\n=== Fin après {self.nombre_tours} tours ===")
+            self._ajouter_etat(lignes, self.final, "unités restantes")
+        if self.issue in _MESSAGES_FIN:
+            lignes.append(_MESSAGES_FIN[self.issue])
+        if self.tours_sautes:
+            lignes.append(f"Aucune perte ce tour : état stable, {self.tours_sautes} tours identiques sautés.")
+        return lignes
+
+    def _ajouter_etat(self, lignes, comptes, libelle):
+        lignes.append("\n--- État des unités ---")
+        lignes.append(f"Attaquant ({self.noms[0]}):")
+        lignes.append("")
+        for nom, compte in zip(self.unites[0], comptes[0]):
+            lignes.append(f"  {nom} : {compte} {libelle}")
+        lignes.append("")
+        lignes.append(f"Défenseur ({self.noms[1]}):")
+        for nom, compte in zip(self.unites[1], comptes[1]):
+            lignes.append(f"  {nom} : {compte} {libelle}")
+        lignes.append("")
+
+    def vers_dict(self):
+        """Forme compacte pour le JSON : chaque tour est une liste de valeurs, dans l'ordre de Tour."""
+        return {
+            "environment": self.environment,
+            "detail": self.detail,
+            "echelle": self.echelle,
+            "issue": self.issue,
+            "tours": self.nombre_tours,
+            "tours_sautes": self.tours_sautes,
+            "attaquant": {"nom": self.noms[0], "unites": self.unites[0],
+                          "initial": self.initial[0], "final": self.final[0]},
+            "defenseur": {"nom": self.noms[1], "unites": self.unites[1],
+                          "initial": self.initial[1], "final": self.final[1]},
+            "deroulement": [list(tour) for tour in self.tours],
+        }
+
+    def vers_deltas(self):
+        """
+        Forme la plus compacte pour le JSON : les effectifs initiaux une seule fois, puis
+        pour chaque tour les dégâts et vies totales, le drapeau « attaque trop forte » (0/1)
+        et les seules pertes non nulles, en liste plate [indice, morts, indice, morts...]
+        (None en dessous du détail complet). Les effectifs de chaque tour s'en déduisent ;
+        `lignes()` peut être reconstruit à l'identique côté client. En mode entier, dégâts
+        et vies sont envoyés déjà écrits en décimal exact (« 1234.5 ») : comptés en millièmes,
+        ils dépassent vite les entiers qu'un nombre JSON lu en JavaScript représente exactement.
+        """
+        valeur = (lambda x: x) if self.echelle == 1 else _format_milliemes
+        deroulement = []
+        for tour in self.tours:
+            if tour.pertes_attaquant is None:
+                pertes = (None, None)
             else:
-                degats_defenseur_effectif = 0
+                pertes = ([v for i, morts in enumerate(tour.pertes_attaquant) if morts for v in (i, morts)],
+                          [v for i, morts in enumerate(tour.pertes_defenseur) if morts for v in (i, morts)])
+            deroulement.append([valeur(tour.degats_attaquant), valeur(tour.vie_attaquant),
+                                valeur(tour.degats_defenseur), valeur(tour.vie_defenseur),
+                                int(tour.attaque_trop_forte), *pertes])
+        return {
+            "format": "deltas",
+            "environment": self.environment,
+            "detail": self.detail,
+            "echelle": self.echelle,
+            "issue": self.issue,
+            "tours": self.nombre_tours,
+            "tours_sautes": self.tours_sautes,
+            "noms": self.noms,
+            "unites": self.unites,
+            "initial": self.initial,
+            "final": self.final,
+            "deroulement": deroulement,
+        }
 
 
-def combat(joueur_attaquant, joueur_defenseur, environment="terrain"):
+def combat(joueur_attaquant, joueur_defenseur, environment="terrain", rapide=False, detail=DETAIL_COMPLET,
+           suivi=None, entier=False):
     """
-    Permet à deux joueurs de se combattre tour par tour.
+    Permet à deux joueurs (Joueur ou Armee) de se combattre tour par tour.
     Les morts sont appliqués uniquement à la fin de chaque tour.
     Si le joueur attaquant tue toutes les unités ennemies, les dégâts de riposte sont réduits de moitié.
-    Retourne un rapport détaillé du combat.
+    Avec `rapide`, le combat s'arrête dès qu'un tour ne tue aucune unité : les tours
+    suivants seraient identiques, l'état final est donc déjà atteint. Le rapport indique
+    alors le nombre de tours sautés.
+    `detail` choisit ce qui est enregistré pour chaque tour (voir DETAILS).
+    `suivi(tour)` est appelé au début de chaque tour ; il peut lever une exception pour
+    interrompre le combat (les joueurs gardent alors leurs effectifs d'origine).
+    Avec `entier`, tous les calculs sont faits en entiers exacts (voir EtatArmeeEntier) :
+    le résultat est reproductible, mais peut différer de quelques unités du calcul
+    flottant sur de très grandes armées ; dégâts et vies du rapport sont en millièmes.
+    Retourne un RapportCombat ; `rapport.lignes()` donne le rapport texte détaillé.
     """
-    rapport = []
-
-    rapport.append("\n--- État des unités ---")
-    rapport.append(f"Attaquant ({joueur_attaquant.name}):")
-    rapport.append("")
-    for unit in joueur_attaquant.units.values():
-        rapport.append(f"  {unit.name} : {unit.unit_count} unités")
-    
-    rapport.append("")
-
-    rapport.append(f"Défenseur ({joueur_defenseur.name}):")
-    for unit in joueur_defenseur.units.values():
-        rapport.append(f"  {unit.name} : {unit.unit_count} unités")
-        
-    rapport.append("")
-
+    if detail not in DETAILS:
+        raise ValueError(f"Niveau de détail inconnu : '{detail}'")
+    mesures = _mesures
+    if mesures is not None:
+        debut = time.perf_counter()
+    if entier:
+        classe_etat = EtatArmeeEntier if mesures is None else _EtatArmeeEntierMesure
+    else:
+        classe_etat = EtatArmee if mesures is None else _EtatArmeeMesure
+    etat_attaquant = classe_etat(joueur_attaquant, None)
+    etat_defenseur = classe_etat(joueur_defenseur, environment)
+    # Les pertes de l'attaquant utilisent les bonus du défenseur, sans environnement
+    vies_pertes_attaquant = [stats[0] for stats in etat_attaquant.stats_avec_bonus(joueur_defenseur, None)]
+    rapport = RapportCombat(etat_attaquant, etat_defenseur, environment, detail, ECHELLE if entier else 1)
 
     tour = 1
 
-    while tour < 20:
-        rapport.append(f"\n=== Tour {tour} ===")
-        # Calcul des dégâts pour ce tour
-        degats_attaquant = calcul_stat(joueur_attaquant, "attack", None)
-        degats_defenseur = calcul_stat(joueur_defenseur, "defense", environment)
-
-        vie_att = calcul_stat(joueur_attaquant, "health", None)
-        vie_def = calcul_stat(joueur_defenseur, "health", environment)
+    while tour <= NOMBRE_TOURS_MAX:
+        if suivi is not None:
+            suivi(tour)
 
-        rapport.append(f"Dégâts infligés par l'attaquant : {degats_attaquant}")
-        rapport.append(f"Vie de l'attaquant : {vie_att}")
-        rapport.append(f"Dégâts infligés par le défenseur : {degats_defenseur}")
-        rapport.append(f"Vie du défenseur : {vie_def}")
-        
-        if degats_attaquant >= vie_def:
-            rapport.append("Attaque trop forte degats de la defense divisé par 2.")
-            degats_defenseur /= 2
-        
-        appliquer_degats(joueur_attaquant, joueur_defenseur, degats_attaquant, degats_defenseur, environment)
+        # Calcul des dégâts pour ce tour
+        degats_attaquant = etat_attaquant.total("attack")
+        degats_defenseur = etat_defenseur.total("defense")
+        vie_def = etat_defenseur.total("health")
+        if detail != DETAIL_ISSUE:
+            vie_att = etat_attaquant.total("health")
+
+        attaque_trop_forte = degats_attaquant >= vie_def
+        if attaque_trop_forte:
+            # En entiers, la défense est un multiple de 50 millièmes : la moitié reste exacte
+            degats_riposte = degats_defenseur // 2 if entier else degats_defenseur / 2
+        else:
+            degats_riposte = degats_defenseur
 
+        pertes_def = etat_defenseur.subir(degats_attaquant)
+        pertes_att = etat_attaquant.subir(degats_riposte, vies_pertes_attaquant)
+        rapport.nombre_tours = tour
 
-        # Ajout d'un résumé de l'état des unités
-        rapport.append("\n--- État des unités ---")
-        rapport.append(f"Attaquant ({joueur_attaquant.name}):")
-        rapport.append("")
-        for unit in joueur_attaquant.units.values():
-            rapport.append(f"  {unit.name} : {unit.unit_count} unités restantes")
-        
-        rapport.append("")
+        if detail == DETAIL_COMPLET:
+            rapport.tours.append(Tour(tour, degats_attaquant, vie_att, degats_defenseur, vie_def,
+                                      attaque_trop_forte, pertes_att, pertes_def))
+        elif detail == DETAIL_TOURS:
+            rapport.tours.append(Tour(tour, degats_attaquant, vie_att, degats_defenseur, vie_def,
+                                      attaque_trop_forte, None, None))
 
-        rapport.append(f"Défenseur ({joueur_defenseur.name}):")
-        for unit in joueur_defenseur.units.values():
-            rapport.append(f"  {unit.name} : {unit.unit_count} unités restantes")
-            
-        rapport.append("")
-        
-        
         # Vérification si toutes les unités des deux joueurs sont détruites
-        if all(unit.unit_count == 0 for unit in joueur_defenseur.units.values()) and \
-           all(unit.unit_count == 0 for unit in joueur_attaquant.units.values()):
-            rapport.append("Toutes les unités des deux joueurs ont été détruites. Match nul.")
+        defenseur_detruit = etat_defenseur.detruite()
+        attaquant_detruit = etat_attaquant.detruite()
+        if defenseur_detruit and attaquant_detruit:
+            rapport.issue = "nul"
             break
-
-        # Vérification si toutes les unités du defenseur sont détruites
-        if all(unit.unit_count == 0 for unit in joueur_defenseur.units.values()):
-            rapport.append("Toutes les unités du defenseur ont été détruites. Fin du combat.")
+        if defenseur_detruit:
+            rapport.issue = "victoire"
             break
-        
-        # Vérification si toutes les unités de l'attaquant sont détruites
-        if all(unit.unit_count == 0 for unit in joueur_attaquant.units.values()):
-            rapport.append("Toutes les unités de l'attaquant ont été détruites. Fin du combat.")
+        if attaquant_detruit:
+            rapport.issue = "defaite"
+            break
+
+        # Aucune perte : les tours restants répéteraient celui-ci à l'identique
+        if rapide and tour < NOMBRE_TOURS_MAX and not any(pertes_att) and not any(pertes_def):
+            rapport.tours_sautes = NOMBRE_TOURS_MAX - tour
             break
 
         # Augmenter le numéro du tour
         tour += 1
 
+    etat_attaquant.enregistrer()
+    etat_defenseur.enregistrer()
+    rapport.final = (tuple(etat_attaquant.comptes), tuple(etat_defenseur.comptes))
+    if mesures is not None:
+        _mesurer_combat(mesures, rapport, time.perf_counter() - debut)
     return rapport
 
 
-import tkinter as tk
-from tkinter import messagebox, ttk
-
-
-class CombatApp:
-    def __init__(self, root):
-        self.root = root
-        self.root.title("Simulateur de Combat")
-        
-        # Joueurs
-        self.joueur1 = Joueur("Joueur 1")
-        self.joueur2 = Joueur("Joueur 2")
-
-        # Interface
-        self.create_widgets()
-
-    def create_widgets(self):
-        # Zone de configuration des joueurs
-        frame_joueurs = tk.Frame(self.root)
-        frame_joueurs.pack(pady=10)
-
-        tk.Label(frame_joueurs, text="Joueur 1:").grid(row=0, column=0, padx=5, pady=5)
-        self.joueur1_entry = tk.Entry(frame_joueurs, width=50)
-        self.joueur1_entry.grid(row=0, column=1, padx=5, pady=5)
-
-        tk.Label(frame_joueurs, text="Joueur 2:").grid(row=1, column=0, padx=5, pady=5)
-        self.joueur2_entry = tk.Entry(frame_joueurs, width=50)
-        self.joueur2_entry.grid(row=1, column=1, padx=5, pady=5)
-
-        tk.Button(frame_joueurs, text="Configurer Joueurs", command=self.configurer_joueurs).grid(row=2, column=0, columnspan=2, pady=10)
-
-        # Zone de configuration des bonus
-        frame_bonus = tk.Frame(self.root)
-        frame_bonus.pack(pady=10)
-
-        tk.Label(frame_bonus, text="Joueur").grid(row=0, column=0, padx=5, pady=5)
-        tk.Label(frame_bonus, text="Mandibule").grid(row=0, column=1, padx=5, pady=5)
-        tk.Label(frame_bonus, text="Carapace").grid(row=0, column=2, padx=5, pady=5)
-        tk.Label(frame_bonus, text="Dôme").grid(row=0, column=3, padx=5, pady=5)
-        tk.Label(frame_bonus, text="Loge").grid(row=0, column=4, padx=5, pady=5)
-
-        # Joueur 1
-        tk.Label(frame_bonus, text="Joueur 1").grid(row=1, column=0, padx=5, pady=5)
-        self.joueur1_mandibule = tk.Entry(frame_bonus, width=5)
-        self.joueur1_mandibule.grid(row=1, column=1, padx=5, pady=5)
-        self.joueur1_carapace = tk.Entry(frame_bonus, width=5)
-        self.joueur1_carapace.grid(row=1, column=2, padx=5, pady=5)
-        self.joueur1_dome = tk.Entry(frame_bonus, width=5)
-        self.joueur1_dome.grid(row=1, column=3, padx=5, pady=5)
-        self.joueur1_loge = tk.Entry(frame_bonus, width=5)
-        self.joueur1_loge.grid(row=1, column=4, padx=5, pady=5)
-
-        # Joueur 2
-        tk.Label(frame_bonus, text="Joueur 2").grid(row=2, column=0, padx=5, pady=5)
-        self.joueur2_mandibule = tk.Entry(frame_bonus, width=5)
-        self.joueur2_mandibule.grid(row=2, column=1, padx=5, pady=5)
-        self.joueur2_carapace = tk.Entry(frame_bonus, width=5)
-        self.joueur2_carapace.grid(row=2, column=2, padx=5, pady=5)
-        self.joueur2_dome = tk.Entry(frame_bonus, width=5)
-        self.joueur2_dome.grid(row=2, column=3, padx=5, pady=5)
-        self.joueur2_loge = tk.Entry(frame_bonus, width=5)
-        self.joueur2_loge.grid(row=2, column=4, padx=5, pady=5)
-
-        tk.Button(frame_bonus, text="Configurer Bonus", command=self.configurer_bonus).grid(row=3, column=0, columnspan=5, pady=10)
-
-        # Zone de simulation
-        frame_simulation = tk.Frame(self.root)
-        frame_simulation.pack(pady=10)
-
-        tk.Label(frame_simulation, text="Environnement:").grid(row=0, column=0, padx=5, pady=5)
-        self.environment_combobox = ttk.Combobox(frame_simulation, values=["terrain", "dome", "loge"], state="readonly")
-        self.environment_combobox.set("terrain")
-        self.environment_combobox.grid(row=0, column=1, padx=5, pady=5)
-
-        tk.Button(frame_simulation, text="Lancer Combat", command=self.lancer_combat).grid(row=1, column=0, columnspan=2, pady=10)
-
-        # Zone d'affichage des résultats
-        self.result_text = tk.Text(self.root, height=20, width=80)
-        self.result_text.pack(pady=10)
-
-    def configurer_joueurs(self):
-        """Configure les joueurs à partir des entrées."""
-        try:
-            self.joueur1.importer_unites_depuis_texte(self.joueur1_entry.get())
-            self.joueur2.importer_unites_depuis_texte(self.joueur2_entry.get())
-            messagebox.showinfo("Succès", "Joueurs configurés avec succès !")
-            self.afficher_armee()
-        except Exception as e:
-            messagebox.showerror("Erreur", f"Erreur de configuration : {e}")
-
-    def configurer_bonus(self):
-        """Configure les bonus pour chaque joueur."""
-        try:
-            self.joueur1.mandibule = int(self.joueur1_mandibule.get() or 0)
-            self.joueur1.carapace = int(self.joueur1_carapace.get() or 0)
-            self.joueur1.dome = int(self.joueur1_dome.get() or 0)
-            self.joueur1.loge = int(self.joueur1_loge.get() or 0)
-
-            self.joueur2.mandibule = int(self.joueur2_mandibule.get() or 0)
-            self.joueur2.carapace = int(self.joueur2_carapace.get() or 0)
-            self.joueur2.dome = int(self.joueur2_dome.get() or 0)
-            self.joueur2.loge = int(self.joueur2_loge.get() or 0)
-
-            messagebox.showinfo("Succès", "Bonus configurés avec succès !")
-            self.afficher_armee()
-        except Exception as e:
-            messagebox.showerror("Erreur", f"Erreur de configuration des bonus : {e}")
-
-    def afficher_armee(self):
-        """Affiche l'armée finale des deux joueurs."""
-        self.result_text.delete(1.0, tk.END)
-        self.result_text.insert(tk.END, f"Armée du Joueur 1 ({self.joueur1.name}):\n")
-        for unit in self.joueur1.units.values():
-            self.result_text.insert(tk.END, f"  {unit.name} : {unit.unit_count} unités\n")
-        
-        self.result_text.insert(tk.END, f"\nArmée du Joueur 2 ({self.joueur2.name}):\n")
-        for unit in self.joueur2.units.values():
-            self.result_text.insert(tk.END, f"  {unit.name} : {unit.unit_count} unités\n")
-
-    def lancer_combat(self):
-        """Lance un combat entre les deux joueurs."""
-        environment = self.environment_combobox.get()
-        rapport = "\n".join(combat(self.joueur1, self.joueur2, environment))
-        self.result_text.delete(1.0, tk.END)
-        self.result_text.insert(tk.END, rapport)
+def _mesurer_combat(mesures, rapport, duree):
+    """Compte les tours et classe la durée du combat par forme d'armée (types présents, effectif)."""
+    mesures.compter("simu_combats_total")
+    mesures.compter("simu_tours_total", rapport.nombre_tours)
+    mesures.compter("simu_tours_sautes_total", rapport.tours_sautes)
+    effectif = max(sum(rapport.initial[0]), sum(rapport.initial[1]), 1)
+    mesures.observer(
+        "simu_combat_secondes", duree,
+        types=f"{len(rapport.unites[0])}x{len(rapport.unites[1])}",
+        taille=f"1e{len(str(effectif)) - 1}",
+    )
 
 
-# Lancer l'application
+# Lancer l'application : l'interface Tk n'est importée qu'ici, le moteur reste sans interface
 if __name__ == "__main__":
-    root = tk.Tk()
-    app = CombatApp(root)
-    root.mainloop()
+    from interface_tk import lancer_interface
+    lancer_interface()
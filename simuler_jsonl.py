@@ -0,0 +1,135 @@
+"""
+Simulation en ligne de commande : un combat par ligne JSONL en entrée, un résultat par
+ligne en sortie, écrit au fur et à mesure.
+
+Chaque ligne d'entrée a la même forme que le corps de /simulate :
+{"attaquant": {"armee": "...", "mandibule": 0, ...}, "defenseur": {...}, "environment": "terrain"}
+avec en option "rapide", "entier", "detail" et "id" (recopié dans le résultat).
+
+    python simuler_jsonl.py combats.jsonl -o resultats.jsonl --workers 8
+    zcat combats.jsonl.gz | python simuler_jsonl.py --workers 8 --desordre > resultats.jsonl
+
+La mémoire reste constante : l'entrée est lue par blocs et seul un nombre borné de blocs
+est en cours de simulation à un instant donné.
+"""
+
+import argparse
+import json
+import sys
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from simucombats import DETAIL_ISSUE, DETAILS, ENVIRONNEMENTS, combat, creer_joueur
+
+
+TAILLE_BLOC = 256
+# Nombre de blocs en attente par processus
+BLOCS_PAR_WORKER = 4
+
+
+def simuler_ligne(ligne, detail=DETAIL_ISSUE):
+    """Simule le combat décrit par une ligne JSON et retourne le résultat (dictionnaire)."""
+    donnees = json.loads(ligne)
+    environment = donnees.get("environment", "terrain")
+    if environment not in ENVIRONNEMENTS:
+        raise ValueError(f"Environnement inconnu : '{environment}'")
+    attaquant = creer_joueur("Attaquant", donnees["attaquant"])
+    defenseur = creer_joueur("Défenseur", donnees["defenseur"])
+    rapport = combat(attaquant, defenseur, environment, bool(donnees.get("rapide", False)),
+                     donnees.get("detail", detail), entier=bool(donnees.get("entier", False)))
+    resultat = {"rapport": rapport.vers_dict(), "status": "success"}
+    if "id" in donnees:
+        resultat["id"] = donnees["id"]
+    return resultat
+
+
+def _simuler_bloc(bloc, detail):
+    """Simule un bloc de lignes numérotées et retourne les lignes JSON de résultat."""
+    sorties = []
+    for numero, ligne in bloc:
+        try:
+            resultat = simuler_ligne(ligne, detail)
+        except Exception as e:
+            resultat = {"message": f"Erreur lors de la simulation : {e}", "status": "error"}
+        resultat["ligne"] = numero
+        sorties.append(json.dumps(resultat, ensure_ascii=False))
+    return sorties
+
+
+def _blocs(lignes, taille_bloc):
+    """Regroupe les lignes non vides en blocs de (numéro de ligne, ligne)."""
+    bloc = []
+    for numero, ligne in enumerate(lignes, 1):
+        if ligne.strip():
+            bloc.append((numero, ligne))
+            if len(bloc) >= taille_bloc:
+                yield bloc
+                bloc = []
+    if bloc:
+        yield bloc
+
+
+def simuler_flux(lignes, workers=None, ordonne=True, detail=DETAIL_ISSUE, taille_bloc=TAILLE_BLOC):
+    """
+    Générateur des lignes de résultat pour un itérable de lignes JSONL.
+
+    Sans `workers`, tout est simulé dans le processus courant. Avec `workers`, les blocs
+    sont répartis sur autant de processus, avec au plus BLOCS_PAR_WORKER blocs en attente
+    par processus. `ordonne` rend les résultats dans l'ordre de l'entrée ; sinon ils sont
+    rendus dès qu'un bloc est terminé (le champ "ligne" permet de les rapprocher).
+    """
+    if detail not in DETAILS:
+        raise ValueError(f"Niveau de détail inconnu : '{detail}'")
+    blocs = _blocs(lignes, taille_bloc)
+    if not workers:
+        for bloc in blocs:
+            yield from _simuler_bloc(bloc, detail)
+        return
+
+    limite = workers * BLOCS_PAR_WORKER
+    with ProcessPoolExecutor(max_workers=workers) as executeur:
+        en_cours = deque()
+        for bloc in blocs:
+            en_cours.append(executeur.submit(_simuler_bloc, bloc, detail))
+            if len(en_cours) >= limite:
+                yield from _terminer(en_cours, ordonne)
+        while en_cours:
+            yield from _terminer(en_cours, ordonne)
+
+
+def _terminer(en_cours, ordonne):
+    """Attend le plus ancien bloc (ou le premier terminé) et retourne ses résultats."""
+    if ordonne:
+        return en_cours.popleft().result()
+    finis, _ = wait(en_cours, return_when=FIRST_COMPLETED)
+    sorties = []
+    for future in finis:
+        en_cours.remove(future)
+        sorties.extend(future.result())
+    return sorties
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simule un combat par ligne JSONL.")
+    parser.add_argument("entree", nargs="?", default="-", help="fichier JSONL (défaut : entrée standard)")
+    parser.add_argument("-o", "--sortie", default="-", help="fichier de résultats (défaut : sortie standard)")
+    parser.add_argument("--workers", type=int, default=None, help="nombre de processus de simulation")
+    parser.add_argument("--desordre", action="store_true", help="écrire les résultats dès qu'ils sont prêts")
+    parser.add_argument("--detail", choices=DETAILS, default=DETAIL_ISSUE, help="niveau de détail des rapports")
+    parser.add_argument("--taille-bloc", type=int, default=TAILLE_BLOC, help="nombre de lignes par bloc")
+    args = parser.parse_args()
+
+    entree = sys.stdin if args.entree == "-" else open(args.entree, encoding="utf-8")
+    sortie = sys.stdout if args.sortie == "-" else open(args.sortie, "w", encoding="utf-8")
+    try:
+        for resultat in simuler_flux(entree, args.workers, not args.desordre, args.detail, args.taille_bloc):
+            sortie.write(resultat + "\n")
+    finally:
+        if entree is not sys.stdin:
+            entree.close()
+        if sortie is not sys.stdout:
+            sortie.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,260 @@
+"""
+Stockage SQLite des armées nommées et des profils de bonus, pour ne plus réanalyser
+les textes d'armée à chaque requête et les partager entre processus et redémarrages.
+
+Chaque type d'unité a sa colonne (effectif entier) ; les listes par propriétaire sont
+servies par un index (proprietaire, mis_a_jour). Chaque thread, et chaque processus,
+réutilise sa propre connexion ; les requêtes sont des constantes paramétrées, préparées
+une seule fois par connexion.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+
+from simucombats import TYPES_UNITES, UNITES_BASE, Armee, analyser_armee
+
+
+NIVEAUX = ("mandibule", "carapace", "dome", "loge")
+# Une colonne par type d'unité, dans l'ordre de TYPES_UNITES
+COLONNES_UNITES = tuple(unit_class.__name__.lower() for unit_class in TYPES_UNITES)
+_INDICES_NOMS = {unit.name: i for i, unit in enumerate(UNITES_BASE)}
+
+_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS armees (
+    id INTEGER PRIMARY KEY,
+    nom TEXT NOT NULL,
+    proprietaire TEXT,
+    {", ".join(f"{colonne} INTEGER NOT NULL DEFAULT 0" for colonne in COLONNES_UNITES)},
+    mis_a_jour REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS armees_proprietaire ON armees (proprietaire, mis_a_jour);
+CREATE INDEX IF NOT EXISTS armees_mis_a_jour ON armees (mis_a_jour);
+CREATE TABLE IF NOT EXISTS profils (
+    id INTEGER PRIMARY KEY,
+    nom TEXT NOT NULL,
+    proprietaire TEXT,
+    {", ".join(f"{niveau} INTEGER NOT NULL DEFAULT 0" for niveau in NIVEAUX)},
+    mis_a_jour REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS profils_proprietaire ON profils (proprietaire, mis_a_jour);
+"""
+
+_CHAMPS_ARMEE = "id, nom, proprietaire, " + ", ".join(COLONNES_UNITES) + ", mis_a_jour"
+_CHAMPS_PROFIL = "id, nom, proprietaire, " + ", ".join(NIVEAUX) + ", mis_a_jour"
+
+_INSERER_ARMEE = (f"INSERT INTO armees (nom, proprietaire, {', '.join(COLONNES_UNITES)}, mis_a_jour) "
+                  f"VALUES ({', '.join('?' * (len(COLONNES_UNITES) + 3))})")
+_MODIFIER_ARMEE = (f"UPDATE armees SET nom = ?, proprietaire = ?, "
+                   f"{', '.join(f'{colonne} = ?' for colonne in COLONNES_UNITES)}, mis_a_jour = ? WHERE id = ?")
+_LIRE_ARMEE = f"SELECT {_CHAMPS_ARMEE} FROM armees WHERE id = ?"
+_LISTER_ARMEES = f"SELECT {_CHAMPS_ARMEE} FROM armees ORDER BY mis_a_jour DESC LIMIT ?"
+_LISTER_ARMEES_PROPRIETAIRE = (f"SELECT {_CHAMPS_ARMEE} FROM armees WHERE proprietaire = ? "
+                               f"ORDER BY mis_a_jour DESC LIMIT ?")
+_SUPPRIMER_ARMEE = "DELETE FROM armees WHERE id = ?"
+
+_INSERER_PROFIL = (f"INSERT INTO profils (nom, proprietaire, {', '.join(NIVEAUX)}, mis_a_jour) "
+                   f"VALUES ({', '.join('?' * (len(NIVEAUX) + 3))})")
+_MODIFIER_PROFIL = (f"UPDATE profils SET nom = ?, proprietaire = ?, "
+                    f"{', '.join(f'{niveau} = ?' for niveau in NIVEAUX)}, mis_a_jour = ? WHERE id = ?")
+_LIRE_PROFIL = f"SELECT {_CHAMPS_PROFIL} FROM profils WHERE id = ?"
+_LISTER_PROFILS = f"SELECT {_CHAMPS_PROFIL} FROM profils ORDER BY mis_a_jour DESC LIMIT ?"
+_LISTER_PROFILS_PROPRIETAIRE = (f"SELECT {_CHAMPS_PROFIL} FROM profils WHERE proprietaire = ? "
+                                f"ORDER BY mis_a_jour DESC LIMIT ?")
+_SUPPRIMER_PROFIL = "DELETE FROM profils WHERE id = ?"
+
+
+def comptes_depuis_donnees(donnees):
+    """
+    Effectifs (ordre de TYPES_UNITES) d'une armée décrite par un dictionnaire :
+    {"comptes": {"Tank": 1000, ...}} avec les noms d'unités au singulier,
+    ou {"armee": "1 000 Tanks, ..."} sous forme de texte. Comme pour
+    Joueur.importer_unites_depuis_texte, une unité répétée dans le texte garde la
+    dernière quantité indiquée.
+    """
+    comptes = [0] * len(TYPES_UNITES)
+    if "comptes" in donnees:
+        for nom, compte in donnees["comptes"].items():
+            if nom not in _INDICES_NOMS:
+                raise ValueError(f"Unité non reconnue : '{nom}'")
+            comptes[_INDICES_NOMS[nom]] = int(compte)
+    else:
+        for unit_class, compte in analyser_armee(donnees.get("armee", "")):
+            comptes[TYPES_UNITES.index(unit_class)] = compte
+    return _verifier_comptes(comptes)
+
+
+def _comptes(armee):
+    """Effectifs d'une Armee, d'un Joueur ou d'une liste déjà dans l'ordre de TYPES_UNITES."""
+    if isinstance(armee, Armee) or not hasattr(armee, "units"):
+        return _verifier_comptes([int(compte) for compte in armee])
+    return _verifier_comptes(list(Armee.depuis_joueur(armee)))
+
+
+def _verifier_comptes(comptes):
+    """Refuse les effectifs négatifs, qui fausseraient les combats une fois relus."""
+    for unit, compte in zip(UNITES_BASE, comptes):
+        if compte < 0:
+            raise ValueError(f"Effectif négatif pour {unit.name} : {compte}")
+    return comptes
+
+
+def _armee_dict(ligne):
+    comptes = ligne[3:3 + len(COLONNES_UNITES)]
+    return {
+        "id": ligne[0],
+        "nom": ligne[1],
+        "proprietaire": ligne[2],
+        "comptes": {unit.name: compte for unit, compte in zip(UNITES_BASE, comptes) if compte},
+        "mis_a_jour": ligne[-1],
+    }
+
+
+def _profil_dict(ligne):
+    return {"id": ligne[0], "nom": ligne[1], "proprietaire": ligne[2],
+            **dict(zip(NIVEAUX, ligne[3:3 + len(NIVEAUX)])), "mis_a_jour": ligne[-1]}
+
+
+class Stockage:
+    """
+    Base SQLite d'armées et de profils de bonus, partageable entre threads et processus.
+
+    Les armées sont lues directement en Armee (sans analyse de texte) ; un profil donne
+    les niveaux mandibule, carapace, dome et loge à appliquer à une armée.
+    """
+
+    def __init__(self, chemin):
+        self.chemin = chemin
+        self._locale = threading.local()
+        with self._connexion() as connexion:
+            connexion.executescript(_SCHEMA)
+
+    def _connexion(self):
+        """Connexion du thread courant, rouverte dans un processus fils après un fork."""
+        locale = self._locale
+        if getattr(locale, "pid", None) != os.getpid():
+            connexion = sqlite3.connect(self.chemin, timeout=30, cached_statements=64)
+            # Lecteurs et écrivain concurrents entre processus
+            connexion.execute("PRAGMA journal_mode=WAL")
+            connexion.execute("PRAGMA synchronous=NORMAL")
+            locale.connexion = connexion
+            locale.pid = os.getpid()
+        return locale.connexion
+
+    def fermer(self):
+        """Ferme la connexion du thread courant."""
+        if getattr(self._locale, "pid", None) == os.getpid():
+            self._locale.connexion.close()
+            del self._locale.pid
+
+    # Armées
+
+    def enregistrer_armee(self, nom, armee, proprietaire=None, armee_id=None):
+        """
+        Enregistre une armée (Armee, Joueur ou liste d'effectifs dans l'ordre de TYPES_UNITES)
+        et retourne son identifiant. Avec `armee_id`, l'armée existante est remplacée.
+        Les niveaux de bonus ne sont pas enregistrés ici (voir enregistrer_profil).
+        """
+        valeurs = [nom, proprietaire] + _comptes(armee) + [time.time()]
+        with self._connexion() as connexion:
+            if armee_id is None:
+                return connexion.execute(_INSERER_ARMEE, valeurs).lastrowid
+            if connexion.execute(_MODIFIER_ARMEE, valeurs + [armee_id]).rowcount == 0:
+                raise ValueError(f"Armée inconnue : {armee_id}")
+            return armee_id
+
+    def armee(self, armee_id, name=None, profil_id=None):
+        """
+        Armee enregistrée sous `armee_id`, nommée `name` (par défaut son nom enregistré),
+        avec les niveaux du profil `profil_id` s'il est donné. Lève ValueError si elle n'existe pas.
+        """
+        ligne = self._connexion().execute(_LIRE_ARMEE, (armee_id,)).fetchone()
+        if ligne is None:
+            raise ValueError(f"Armée inconnue : {armee_id}")
+        niveaux = ()
+        if profil_id is not None:
+            profil = self.profil(profil_id)
+            niveaux = [profil[niveau] for niveau in NIVEAUX]
+        return Armee(ligne[1] if name is None else name, ligne[3:3 + len(COLONNES_UNITES)], *niveaux)
+
+    def description_armee(self, armee_id):
+        """Armée enregistrée sous forme de dictionnaire (effectifs par nom d'unité)."""
+        ligne = self._connexion().execute(_LIRE_ARMEE, (armee_id,)).fetchone()
+        if ligne is None:
+            raise ValueError(f"Armée inconnue : {armee_id}")
+        return _armee_dict(ligne)
+
+    def armees(self, proprietaire=None, limite=100):
+        """Armées les plus récemment modifiées, éventuellement d'un seul propriétaire (dictionnaires)."""
+        if proprietaire is None:
+            lignes = self._connexion().execute(_LISTER_ARMEES, (limite,))
+        else:
+            lignes = self._connexion().execute(_LISTER_ARMEES_PROPRIETAIRE, (proprietaire, limite))
+        return [_armee_dict(ligne) for ligne in lignes]
+
+    def supprimer_armee(self, armee_id):
+        with self._connexion() as connexion:
+            return connexion.execute(_SUPPRIMER_ARMEE, (armee_id,)).rowcount > 0
+
+    def importer(self, armees):
+        """
+        Enregistre en une seule transaction un itérable de dictionnaires
+        {"nom": ..., "proprietaire": ..., "comptes": {...}} ou {..., "armee": "<texte>"}
+        (la forme produite par `exporter`). Retourne le nombre d'armées importées.
+        """
+        maintenant = time.time()
+        lignes = ([donnees.get("nom", ""), donnees.get("proprietaire")]
+                  + comptes_depuis_donnees(donnees) + [maintenant]
+                  for donnees in armees)
+        with self._connexion() as connexion:
+            return connexion.executemany(_INSERER_ARMEE, lignes).rowcount
+
+    def exporter(self, proprietaire=None):
+        """Générateur des armées enregistrées (dictionnaires acceptés par `importer`), par identifiant."""
+        requete = f"SELECT {_CHAMPS_ARMEE} FROM armees"
+        parametres = ()
+        if proprietaire is not None:
+            requete += " WHERE proprietaire = ?"
+            parametres = (proprietaire,)
+        curseur = self._connexion().execute(requete + " ORDER BY id", parametres)
+        while True:
+            lignes = curseur.fetchmany(500)
+            if not lignes:
+                return
+            for ligne in lignes:
+                yield _armee_dict(ligne)
+
+    # Profils de bonus
+
+    def enregistrer_profil(self, nom, niveaux, proprietaire=None, profil_id=None):
+        """
+        Enregistre un profil de bonus (dictionnaire des niveaux, ou Joueur/Armee dont on
+        reprend les niveaux) et retourne son identifiant. Les niveaux absents valent 0.
+        """
+        if not isinstance(niveaux, dict):
+            niveaux = {niveau: getattr(niveaux, niveau) for niveau in NIVEAUX}
+        valeurs = [nom, proprietaire] + [int(niveaux.get(niveau, 0)) for niveau in NIVEAUX] + [time.time()]
+        with self._connexion() as connexion:
+            if profil_id is None:
+                return connexion.execute(_INSERER_PROFIL, valeurs).lastrowid
+            if connexion.execute(_MODIFIER_PROFIL, valeurs + [profil_id]).rowcount == 0:
+                raise ValueError(f"Profil inconnu : {profil_id}")
+            return profil_id
+
+    def profil(self, profil_id):
+        ligne = self._connexion().execute(_LIRE_PROFIL, (profil_id,)).fetchone()
+        if ligne is None:
+            raise ValueError(f"Profil inconnu : {profil_id}")
+        return _profil_dict(ligne)
+
+    def profils(self, proprietaire=None, limite=100):
+        if proprietaire is None:
+            lignes = self._connexion().execute(_LISTER_PROFILS, (limite,))
+        else:
+            lignes = self._connexion().execute(_LISTER_PROFILS_PROPRIETAIRE, (proprietaire, limite))
+        return [_profil_dict(ligne) for ligne in lignes]
+
+    def supprimer_profil(self, profil_id):
+        with self._connexion() as connexion:
+            return connexion.execute(_SUPPRIMER_PROFIL, (profil_id,)).rowcount > 0
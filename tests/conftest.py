@@ -0,0 +1,11 @@
+import os
+import sys
+import tempfile
+
+# Les modules du simulateur sont à la racine du dépôt
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# app ouvre son stockage à l'import : une base temporaire plutôt que armees.db dans le
+# répertoire courant, quel que soit le premier test qui importe app
+_STOCKAGE = tempfile.TemporaryDirectory()
+os.environ["SIMU_STOCKAGE"] = os.path.join(_STOCKAGE.name, "armees.db")
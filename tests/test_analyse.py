@@ -0,0 +1,49 @@
+"""Analyse des textes d'armée : les entrées acceptées par l'ancien analyseur le restent."""
+
+import pytest
+
+from simucombats import (Esclave, Gardienne, GardienneElite, JeuneTank, Joueur, Legionnaire, SoldateElite,
+                         Tank, analyser_armee, analyser_armees)
+
+
+# Textes acceptés par l'analyseur d'origine, avec le résultat qu'il en tirait
+TEXTES = [
+    ("1 000 Tanks, 500 Légionnaires", [(Tank, 1000), (Legionnaire, 500)]),
+    ("12 Soldates d'élite, 3 Jeunes tanks", [(SoldateElite, 12), (JeuneTank, 3)]),
+    ("5 Gardiennes d'élite ,6 Esclaves", [(GardienneElite, 5), (Esclave, 6)]),
+    ("1000 Tanks.", [(Tank, 1000)]),
+    ("1000 Tanks (x)", [(Tank, 1000)]),
+    ("1000 Tanks / 500 Esclaves", [(Tank, 1000), (Esclave, 500)]),
+    ("1000 Tanks ; 20 Gardiennes", [(Tank, 1000), (Gardienne, 20)]),
+    ("100\t\tTanks", [(Tank, 100)]),
+    ("100\n\nTanks, 5 Esclaves", [(Tank, 100), (Esclave, 5)]),
+    ("1000  Tanks, 5\t Esclaves", [(Tank, 1000), (Esclave, 5)]),
+    ("1 000\t Tanks", [(Tank, 1000)]),
+]
+
+
+@pytest.mark.parametrize("texte, attendu", TEXTES)
+def test_textes_historiques(texte, attendu):
+    assert analyser_armee(texte) == attendu
+    assert analyser_armees([texte]) == [attendu]
+    joueur = Joueur("J")
+    joueur.importer_unites_depuis_texte(texte)
+    assert [(type(unit), unit.unit_count) for unit in joueur.units.values()] == attendu
+
+
+def test_unite_inconnue():
+    with pytest.raises(ValueError, match="Unité non reconnue : 'Dragons'"):
+        analyser_armee("10 Dragons")
+    with pytest.raises(ValueError, match="Texte 2 : unité non reconnue"):
+        analyser_armees(["1 Tank", "10 Dragons"])
+
+
+def test_table_des_noms_bornee():
+    from simucombats import NOMS_UNITES, _classe_nom
+
+    taille = len(NOMS_UNITES)
+    for k in range(3000):
+        # Autant d'orthographes brutes différentes d'un même nom normalisé
+        assert analyser_armee("1 Jeunes" + " " * (k + 1) + "tanks") == [(JeuneTank, 1)]
+    assert len(NOMS_UNITES) == taille
+    assert _classe_nom.cache_info().currsize <= _classe_nom.cache_info().maxsize
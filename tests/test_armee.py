@@ -0,0 +1,19 @@
+"""Armee : copies."""
+
+import copy
+
+import pytest
+
+from simucombats import TYPES_UNITES, Armee
+
+
+@pytest.mark.parametrize("copie", [copy.copy, copy.deepcopy, Armee.copier])
+@pytest.mark.parametrize("compte", [1000, 2**40])
+def test_copie(copie, compte):
+    armee = Armee("a", [compte] + [7] * (len(TYPES_UNITES) - 1), mandibule=5, carapace=10, dome=3, loge=2)
+    double = copie(armee)
+    assert type(double) is Armee
+    assert double == armee
+    assert double.typecode == armee.typecode
+    double[0] -= 1
+    assert armee[0] == compte
@@ -0,0 +1,34 @@
+"""Cache des rapports : même résultat que le combat joué directement, dans l'ordre d'import."""
+
+import json
+
+import pytest
+
+from simuler_jsonl import simuler_ligne
+
+CORPS = [
+    {"attaquant": {"armee": "100 Tanks"}, "defenseur": {"armee": "1000 Gardiennes, 1000 Esclaves"}},
+    {"attaquant": {"armee": "100 Tanks"}, "defenseur": {"armee": "1000 Esclaves, 1000 Gardiennes"}},
+]
+
+
+@pytest.fixture
+def client():
+    import app
+
+    app.cache_rapports.vider()
+    return app.app.test_client()
+
+
+def test_simulate_comme_la_ligne_de_commande(client):
+    finaux = []
+    for corps in CORPS:
+        attendu = json.loads(json.dumps(simuler_ligne(json.dumps(corps))["rapport"]))
+        # Le second appel vient du cache
+        for _ in range(2):
+            rapport = client.post("/simulate", json={**corps, "detail": "issue"}).get_json()["rapport"]
+            assert rapport == attendu
+        finaux.append(rapport)
+    # Les deux ordres ne donnent pas les mêmes pertes : ils ne partagent pas leur entrée
+    assert finaux[0] != finaux[1]
+    assert client.get("/statistiques_cache").get_json()["succes"] == 2
@@ -0,0 +1,37 @@
+"""Mode rapide : arrêter le combat à l'état stable ne change pas son issue."""
+
+import random
+
+import pytest
+
+from simucombats import ENVIRONNEMENTS, NOMBRE_TOURS_MAX, UNITES_BASE, Armee, combat
+
+
+def _armee(aleatoire, nom):
+    comptes = [0] * len(UNITES_BASE)
+    # Une armée sur deux est minuscule : les combats sans perte mènent à l'état stable
+    maximum = aleatoire.choice([3, 10 ** aleatoire.randint(1, 7)])
+    for i in aleatoire.sample(range(len(UNITES_BASE)), aleatoire.randint(1, 5)):
+        comptes[i] = aleatoire.randint(1, maximum)
+    return Armee(nom, comptes, *(aleatoire.randint(0, 40) for _ in range(4)))
+
+
+@pytest.mark.parametrize("entier", [False, True])
+def test_rapide_meme_etat_final(entier):
+    aleatoire = random.Random(9)
+    sautes = 0
+    for _ in range(1500):
+        attaquant, defenseur = _armee(aleatoire, "A"), _armee(aleatoire, "D")
+        environment = aleatoire.choice(ENVIRONNEMENTS)
+        complet = combat(attaquant.copier(), defenseur.copier(), environment, detail="issue", entier=entier)
+        rapide = combat(attaquant.copier(), defenseur.copier(), environment, rapide=True, detail="issue",
+                        entier=entier)
+        assert rapide.final == complet.final
+        assert rapide.issue == complet.issue
+        if rapide.tours_sautes:
+            sautes += 1
+            assert rapide.nombre_tours + rapide.tours_sautes == NOMBRE_TOURS_MAX == complet.nombre_tours
+        else:
+            assert rapide.nombre_tours == complet.nombre_tours
+    # Le cas de l'état stable est bien exercé
+    assert sautes >= 20
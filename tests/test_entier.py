@@ -0,0 +1,92 @@
+"""Mode entier du moteur de combat : le calcul exact, en fractions, sans aucun arrondi."""
+
+import math
+import random
+from fractions import Fraction
+
+import pytest
+
+from simucombats import ECHELLE, ENVIRONNEMENTS, NOMBRE_TOURS_MAX, UNITES_BASE, Armee, combat, creer_joueur
+
+
+def _stats(unit, bonus, environment):
+    """Statistiques effectives exactes : 5 % par niveau, comme table_stats."""
+    mandibule, carapace, dome, loge = bonus
+    vie = 1 + Fraction(5, 100) * carapace
+    if environment == "dome":
+        vie += Fraction(25, 1000) * dome + Fraction(5, 100)
+    elif environment == "loge":
+        vie += Fraction(5, 100) * loge + Fraction(10, 100)
+    return unit.health * vie, unit.attack * (1 + Fraction(5, 100) * mandibule), \
+        unit.defense * (1 + Fraction(5, 100) * mandibule)
+
+
+def _subir(comptes, degats, vies):
+    for i, compte in enumerate(comptes):
+        if degats > 0 and compte > 0:
+            morts = math.floor(degats / vies[i])
+            if morts < compte:
+                degats = 0
+            else:
+                morts = compte
+                degats -= compte * vies[i]
+            comptes[i] = compte - morts
+
+
+def combat_fractions(attaquant, defenseur, bonus_att, bonus_def, environment):
+    """Combat de référence en fractions : (effectifs finaux, tours, issue, totaux de chaque tour)."""
+    attaquant, defenseur = list(attaquant), list(defenseur)
+    stats_att = [_stats(unit, bonus_att, None) for unit in UNITES_BASE]
+    stats_def = [_stats(unit, bonus_def, environment) for unit in UNITES_BASE]
+    vies_pertes_att = [_stats(unit, bonus_def, None)[0] for unit in UNITES_BASE]
+    totaux = []
+    for tour in range(1, NOMBRE_TOURS_MAX + 1):
+        degats_att = sum(stats[1] * compte for stats, compte in zip(stats_att, attaquant))
+        vie_att = sum(stats[0] * compte for stats, compte in zip(stats_att, attaquant))
+        degats_def = sum(stats[2] * compte for stats, compte in zip(stats_def, defenseur))
+        vie_def = sum(stats[0] * compte for stats, compte in zip(stats_def, defenseur))
+        totaux.append((degats_att, vie_att, degats_def, vie_def))
+        riposte = degats_def / 2 if degats_att >= vie_def else degats_def
+        _subir(defenseur, degats_att, [stats[0] for stats in stats_def])
+        _subir(attaquant, riposte, vies_pertes_att)
+        if not any(defenseur) or not any(attaquant):
+            issue = "nul" if not any(defenseur) and not any(attaquant) else \
+                "victoire" if not any(defenseur) else "defaite"
+            return attaquant, defenseur, tour, issue, totaux
+    return attaquant, defenseur, NOMBRE_TOURS_MAX, "limite", totaux
+
+
+def _armee(aleatoire, nom):
+    comptes = [0] * len(UNITES_BASE)
+    maximum = 10 ** aleatoire.randint(1, 12)
+    for i in aleatoire.sample(range(len(UNITES_BASE)), aleatoire.randint(1, 6)):
+        comptes[i] = aleatoire.randint(1, maximum)
+    return Armee(nom, comptes, *(aleatoire.randint(0, 40) for _ in range(4)))
+
+
+def test_identique_au_calcul_en_fractions():
+    aleatoire = random.Random(21)
+    for _ in range(300):
+        attaquant, defenseur = _armee(aleatoire, "A"), _armee(aleatoire, "D")
+        environment = aleatoire.choice(ENVIRONNEMENTS)
+        bonus_att = (attaquant.mandibule, attaquant.carapace, attaquant.dome, attaquant.loge)
+        bonus_def = (defenseur.mandibule, defenseur.carapace, defenseur.dome, defenseur.loge)
+        final_att, final_def, tours, issue, totaux = combat_fractions(attaquant, defenseur, bonus_att,
+                                                                      bonus_def, environment)
+        rapport = combat(attaquant, defenseur, environment, detail="tours", entier=True)
+        assert list(attaquant) == final_att
+        assert list(defenseur) == final_def
+        assert (rapport.nombre_tours, rapport.issue) == (tours, issue)
+        assert [tuple(Fraction(valeur, ECHELLE) for valeur in tour[1:5]) for tour in rapport.tours] == totaux
+
+
+@pytest.mark.parametrize("carapace", [-20, -21, -30])
+def test_vie_nulle_ou_negative(carapace):
+    rapports = []
+    for entier in (False, True):
+        attaquant = creer_joueur("A", {"armee": "1000 Tanks"})
+        defenseur = creer_joueur("D", {"armee": "10000 Esclaves, 10 Tanks", "carapace": carapace})
+        rapports.append(combat(attaquant, defenseur, "terrain", detail="issue", entier=entier))
+    assert rapports[1].final == rapports[0].final
+    assert rapports[1].issue == rapports[0].issue
+    assert all(compte <= 10**4 for compte in rapports[1].final[1])
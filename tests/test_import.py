@@ -0,0 +1,37 @@
+"""Démarrage à froid du moteur : ni interface Tk ni Flask, et un import rapide."""
+
+import json
+import os
+import subprocess
+import sys
+
+
+# Budget de l'import du moteur seul, en secondes (environ 15 ms mesurées ; large marge pour les machines lentes)
+BUDGET_IMPORT = 0.15
+
+_SCRIPT = """
+import json, sys, time
+debut = time.perf_counter()
+import simucombats
+duree = time.perf_counter() - debut
+print(json.dumps({"duree": duree, "modules": sorted(sys.modules)}))
+"""
+
+
+def _importer():
+    dossier = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    sortie = subprocess.run([sys.executable, "-c", _SCRIPT], cwd=dossier, check=True,
+                            capture_output=True, text=True).stdout
+    return json.loads(sortie)
+
+
+def test_import_sans_interface():
+    modules = _importer()["modules"]
+    for interdit in ("tkinter", "flask", "numpy", "interface_tk"):
+        assert interdit not in modules
+
+
+def test_import_dans_le_budget():
+    # Meilleur de trois démarrages, pour ne pas dépendre d'un pic de charge
+    duree = min(_importer()["duree"] for _ in range(3))
+    assert duree < BUDGET_IMPORT, f"import de simucombats en {duree * 1000:.1f} ms"
@@ -0,0 +1,44 @@
+"""Les armées du front de Pareto sont minimales : retirer une unité les fait perdre."""
+
+from optimiseur import armee_minimale, front_pareto
+from simucombats import TYPES_UNITES, Gardienne, Joueur, Legionnaire, Tank, Tirailleuse, combat
+
+
+def _defenseur():
+    defenseur = Joueur("D")
+    defenseur.ajouter_unite(Gardienne, 5000)
+    defenseur.ajouter_unite(Tirailleuse, 2000)
+    defenseur.carapace = 10
+    defenseur.dome = 5
+    return defenseur
+
+
+def _gagne(defenseur, armee, environment):
+    attaquant = Joueur("A")
+    # Ordre de TYPES_UNITES, comme dans la recherche
+    for unit_class in TYPES_UNITES:
+        if armee.get(unit_class):
+            attaquant.ajouter_unite(unit_class, armee[unit_class])
+    return combat(attaquant, defenseur.copier(), environment).issue == "victoire"
+
+
+def test_front_minimal():
+    defenseur = _defenseur()
+    unites = [Tank, Legionnaire, Tirailleuse]
+    front = front_pareto(defenseur, unites, "dome")
+    assert front
+    for armee in front:
+        assert _gagne(defenseur, armee, "dome"), armee
+        for unit_class, quantite in armee.items():
+            if quantite:
+                moins_un = {**armee, unit_class: quantite - 1}
+                assert not _gagne(defenseur, moins_un, "dome"), (armee, unit_class)
+
+
+def test_armee_minimale_sur_le_front():
+    defenseur = _defenseur()
+    unites = [Tank, Legionnaire]
+    front = front_pareto(defenseur, unites, "dome")
+    meilleure = armee_minimale(defenseur, unites, "dome")
+    assert meilleure in front
+    assert sum(meilleure.values()) == min(sum(armee.values()) for armee in front)
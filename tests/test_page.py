@@ -0,0 +1,58 @@
+"""La page reconstruit le rapport texte du serveur à partir du format "deltas"."""
+
+import json
+import os
+import random
+import shutil
+import subprocess
+
+import pytest
+
+from simucombats import DETAILS, ENVIRONNEMENTS, UNITES_BASE, Armee, combat
+
+
+PAGE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "templates", "index.html")
+
+pytestmark = pytest.mark.skipif(shutil.which("node") is None, reason="node n'est pas installé")
+
+
+def _rendre_dans_la_page(rapports):
+    """Lignes reconstruites par lignesRapport (templates/index.html), exécutée par node."""
+    with open(PAGE, encoding="utf-8") as fichier:
+        page = fichier.read()
+    debut = page.index("        // Un flottant écrit comme str() le fait en Python")
+    fin = page.index("        let travailEnCours")
+    script = (page[debut:fin] + "\nconst rapports = JSON.parse(require('fs').readFileSync(0, 'utf8'));\n"
+              "process.stdout.write(JSON.stringify(rapports.map(lignesRapport)));\n")
+    sortie = subprocess.run(["node", "-e", script], input=json.dumps(rapports), capture_output=True,
+                            text=True, check=True, encoding="utf-8")
+    return json.loads(sortie.stdout)
+
+
+def _armee(aleatoire, nom, maximum):
+    comptes = [0] * len(UNITES_BASE)
+    for i in aleatoire.sample(range(len(UNITES_BASE)), aleatoire.randint(1, 5)):
+        comptes[i] = aleatoire.randint(1, maximum)
+    return Armee(nom, comptes, *(aleatoire.randint(0, 40) for _ in range(4)))
+
+
+def _rapports(nombre, graine, maximum, entier, details=DETAILS):
+    aleatoire = random.Random(graine)
+    return [combat(_armee(aleatoire, "A", maximum), _armee(aleatoire, "D", maximum),
+                   aleatoire.choice(ENVIRONNEMENTS), aleatoire.random() < 0.5, aleatoire.choice(details),
+                   entier=entier)
+            for _ in range(nombre)]
+
+
+# Les grandes armées font passer les flottants en notation exponentielle (au-delà de 1e16)
+@pytest.mark.parametrize("entier, maximum", [(False, 10**4), (False, 10**15), (True, 10**7)])
+def test_deltas_rendus_comme_lignes(entier, maximum):
+    rapports = _rapports(300, 20, maximum, entier)
+    assert _rendre_dans_la_page([r.vers_deltas() for r in rapports]) == [r.lignes() for r in rapports]
+
+
+def test_mode_entier_grandes_armees():
+    # Au-delà de 10**9 unités, les totaux en millièmes dépassent 2**53
+    rapports = _rapports(100, 21, 10**11, entier=True, details=("complet",))
+    assert any(tour.vie_attaquant > 2**53 for rapport in rapports for tour in rapport.tours)
+    assert _rendre_dans_la_page([r.vers_deltas() for r in rapports]) == [r.lignes() for r in rapports]
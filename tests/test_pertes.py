@@ -0,0 +1,95 @@
+"""
+Non-régression du calcul des pertes : la forme fermée de calcul_pertes et appliquer_degats
+doivent donner exactement les résultats de la boucle historique, unité par unité.
+"""
+
+import random
+
+from simucombats import ENVIRONNEMENTS, TYPES_UNITES, Joueur, appliquer_degats, calcul_pertes
+
+
+def pertes_boucle(degats, vie, unit_count):
+    """Boucle historique : retire `vie` des dégâts pour chaque unité tuée."""
+    morts = 0
+    while degats > 0 and morts < unit_count:
+        if degats >= vie:
+            degats -= vie
+            morts += 1
+        else:
+            degats = 0
+    if morts < unit_count:
+        degats = 0
+    return morts, degats
+
+
+def appliquer_degats_boucle(attaquant, defenseur, degats_attaque, degats_defense, environment):
+    """appliquer_degats d'origine, avec la boucle unité par unité."""
+    for unit in defenseur.units.values():
+        vie = unit.effective_stats(defenseur.mandibule, defenseur.carapace, defenseur.dome,
+                                   defenseur.loge, environment)["health"]
+        while degats_attaque > 0 and unit.unit_count > 0:
+            if degats_attaque >= vie:
+                degats_attaque -= vie
+                unit.unit_count -= 1
+            else:
+                degats_attaque = 0
+    for unit in attaquant.units.values():
+        vie = unit.effective_stats(defenseur.mandibule, defenseur.carapace, defenseur.dome,
+                                   defenseur.loge, None)["health"]
+        while degats_defense > 0 and unit.unit_count > 0:
+            if degats_defense >= vie:
+                degats_defense -= vie
+                unit.unit_count -= 1
+            else:
+                degats_defense = 0
+
+
+def _joueur_aleatoire(aleatoire, name):
+    joueur = Joueur(name)
+    for unit_class in aleatoire.sample(TYPES_UNITES, aleatoire.randint(1, 6)):
+        joueur.ajouter_unite(unit_class, aleatoire.randint(0, 3000))
+    joueur.mandibule, joueur.carapace, joueur.dome, joueur.loge = (aleatoire.randint(0, 40) for _ in range(4))
+    return joueur
+
+
+def _comptes(joueur):
+    return [unit.unit_count for unit in joueur.units.values()]
+
+
+def test_calcul_pertes_identique_a_la_boucle():
+    aleatoire = random.Random(1)
+    for _ in range(20000):
+        vie = aleatoire.choice([aleatoire.randint(1, 500), aleatoire.uniform(0.5, 500)])
+        unit_count = aleatoire.randint(0, 5000)
+        # Dégâts autour de la vie totale du type, y compris au-delà (report au type suivant)
+        degats = aleatoire.uniform(0, 1.2) * vie * max(unit_count, 1)
+        if aleatoire.random() < 0.2:
+            degats = float(round(degats))
+        assert calcul_pertes(degats, vie, unit_count) == pertes_boucle(degats, vie, unit_count)
+
+
+def test_calcul_pertes_grands_degats():
+    # Dégâts proches de 2**53 : chaque soustraction est arrondie
+    aleatoire = random.Random(2)
+    for _ in range(2000):
+        vie = aleatoire.uniform(0.1, 4)
+        degats = aleatoire.uniform(2**52, 2**54)
+        unit_count = aleatoire.randint(1, 3000)
+        assert calcul_pertes(degats, vie, unit_count) == pertes_boucle(degats, vie, unit_count)
+
+
+def test_appliquer_degats_identique_a_la_boucle():
+    aleatoire = random.Random(3)
+    for _ in range(500):
+        attaquant = _joueur_aleatoire(aleatoire, "A")
+        defenseur = _joueur_aleatoire(aleatoire, "D")
+        environment = aleatoire.choice(ENVIRONNEMENTS)
+        degats_attaque = aleatoire.uniform(0, 200000)
+        degats_defense = aleatoire.uniform(0, 200000)
+        attaquant_ref, defenseur_ref = attaquant.copier(), defenseur.copier()
+
+        appliquer_degats(attaquant, defenseur, degats_attaque, degats_defense, environment)
+        appliquer_degats_boucle(attaquant_ref, defenseur_ref, degats_attaque, degats_defense, environment)
+
+        assert _comptes(attaquant) == _comptes(attaquant_ref)
+        assert _comptes(defenseur) == _comptes(defenseur_ref)
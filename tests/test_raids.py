@@ -0,0 +1,44 @@
+"""Chaînes de raids : ordre_optimal trouve le meilleur ordre, comme une recherche exhaustive."""
+
+import itertools
+import random
+
+import pytest
+
+from raids import ChaineRaids
+from simucombats import ENVIRONNEMENTS, UNITES_BASE, Armee
+
+
+def _armee(aleatoire, nom, maximum):
+    comptes = [0] * len(UNITES_BASE)
+    for i in aleatoire.sample(range(len(UNITES_BASE)), aleatoire.randint(1, 4)):
+        comptes[i] = aleatoire.randint(1, maximum)
+    return Armee(nom, comptes, *(aleatoire.randint(0, 20) for _ in range(4)))
+
+
+def _chaine(aleatoire, entier=False):
+    vagues = [_armee(aleatoire, f"V{k}", 10**4) for k in range(aleatoire.randint(2, 4))]
+    if aleatoire.random() < 0.5:
+        vagues.append(vagues[0].copier())  # vagues identiques : une seule est permutée
+    aleatoire.shuffle(vagues)
+    cout = aleatoire.choice([sum, lambda pertes: sum(p * unit.health for p, unit in zip(pertes, UNITES_BASE))])
+    return ChaineRaids(vagues, _armee(aleatoire, "D", 10**4), aleatoire.choice(ENVIRONNEMENTS),
+                       cout=cout, entier=entier)
+
+
+@pytest.mark.parametrize("entier", [False, True])
+def test_ordre_optimal_comme_la_force_brute(entier):
+    aleatoire = random.Random(18)
+    differents = 0
+    for _ in range(40):
+        chaine = _chaine(aleatoire, entier)
+        couts = {ordre: chaine.simuler(ordre).pertes_totales
+                 for ordre in itertools.permutations(range(len(chaine.vagues)))}
+        meilleur = min(couts.values())
+        resultat = chaine.ordre_optimal()
+        assert resultat.pertes_totales == meilleur
+        assert resultat.ordre == min(ordre for ordre, cout in couts.items() if cout == meilleur)
+        assert chaine.evaluer() == {ordre: couts[ordre] for ordre in chaine.ordres()}
+        differents += len(set(couts.values())) > 1
+    # L'ordre compte dans la plupart des chaînes tirées
+    assert differents >= 20
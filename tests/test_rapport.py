@@ -0,0 +1,92 @@
+"""
+Le rapport texte rendu par RapportCombat.lignes() au détail complet est, ligne pour
+ligne, celui que combat produisait directement avant le journal structuré.
+"""
+
+import random
+
+from simucombats import DETAIL_COMPLET, ENVIRONNEMENTS, TYPES_UNITES, Joueur, combat
+
+
+def _stat(joueur, stat, environment):
+    total = 0
+    for unit in joueur.units.values():
+        if unit.unit_count > 0:
+            stats = unit.effective_stats(joueur.mandibule, joueur.carapace, joueur.dome, joueur.loge, environment)
+            total += stats[stat] * unit.unit_count
+    return total
+
+
+def _subir(joueur, degats, bonus, environment):
+    for unit in joueur.units.values():
+        vie = unit.effective_stats(bonus.mandibule, bonus.carapace, bonus.dome, bonus.loge, environment)["health"]
+        while degats > 0 and unit.unit_count > 0:
+            if degats >= vie:
+                degats -= vie
+                unit.unit_count -= 1
+            else:
+                degats = 0
+
+
+def _etat(rapport, attaquant, defenseur, libelle):
+    rapport.append("\n--- État des unités ---")
+    rapport.append(f"Attaquant ({attaquant.name}):")
+    rapport.append("")
+    for unit in attaquant.units.values():
+        rapport.append(f"  {unit.name} : {unit.unit_count} {libelle}")
+    rapport.append("")
+    rapport.append(f"Défenseur ({defenseur.name}):")
+    for unit in defenseur.units.values():
+        rapport.append(f"  {unit.name} : {unit.unit_count} {libelle}")
+    rapport.append("")
+
+
+def combat_historique(attaquant, defenseur, environment):
+    """combat d'origine : le rapport texte est construit pendant le combat, unité par unité."""
+    rapport = []
+    _etat(rapport, attaquant, defenseur, "unités")
+    for tour in range(1, 20):
+        rapport.append(f"\n=== Tour {tour} ===")
+        degats_attaquant = _stat(attaquant, "attack", None)
+        degats_defenseur = _stat(defenseur, "defense", environment)
+        rapport.append(f"Dégâts infligés par l'attaquant : {degats_attaquant}")
+        rapport.append(f"Vie de l'attaquant : {_stat(attaquant, 'health', None)}")
+        rapport.append(f"Dégâts infligés par le défenseur : {degats_defenseur}")
+        vie_def = _stat(defenseur, "health", environment)
+        rapport.append(f"Vie du défenseur : {vie_def}")
+        if degats_attaquant >= vie_def:
+            rapport.append("Attaque trop forte degats de la defense divisé par 2.")
+            degats_defenseur /= 2
+        _subir(defenseur, degats_attaquant, defenseur, environment)
+        _subir(attaquant, degats_defenseur, defenseur, None)
+        _etat(rapport, attaquant, defenseur, "unités restantes")
+        defenseur_detruit = all(unit.unit_count == 0 for unit in defenseur.units.values())
+        attaquant_detruit = all(unit.unit_count == 0 for unit in attaquant.units.values())
+        if defenseur_detruit and attaquant_detruit:
+            rapport.append("Toutes les unités des deux joueurs ont été détruites. Match nul.")
+            break
+        if defenseur_detruit:
+            rapport.append("Toutes les unités du defenseur ont été détruites. Fin du combat.")
+            break
+        if attaquant_detruit:
+            rapport.append("Toutes les unités de l'attaquant ont été détruites. Fin du combat.")
+            break
+    return rapport
+
+
+def _joueur(aleatoire, name):
+    joueur = Joueur(name)
+    # Ordre d'import quelconque, effectifs assez petits pour la boucle unité par unité
+    for unit_class in aleatoire.sample(TYPES_UNITES, aleatoire.randint(1, 6)):
+        joueur.ajouter_unite(unit_class, aleatoire.randint(0, 3000))
+    joueur.mandibule, joueur.carapace, joueur.dome, joueur.loge = (aleatoire.randint(0, 40) for _ in range(4))
+    return joueur
+
+
+def test_lignes_identiques_au_rapport_historique():
+    aleatoire = random.Random(10)
+    for _ in range(400):
+        attaquant, defenseur = _joueur(aleatoire, "A"), _joueur(aleatoire, "D")
+        environment = aleatoire.choice(ENVIRONNEMENTS)
+        attendu = combat_historique(attaquant.copier(), defenseur.copier(), environment)
+        assert combat(attaquant, defenseur, environment, detail=DETAIL_COMPLET).lignes() == attendu
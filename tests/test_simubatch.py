@@ -0,0 +1,83 @@
+"""
+Le moteur vectorisé donne, ligne par ligne, exactement le résultat de `combat`
+(effectifs finaux, nombre de tours et issue), y compris quand les dégâts frôlent
+un multiple de la vie et que les lignes douteuses sont recalculées.
+"""
+
+import random
+
+import numpy as np
+import pytest
+
+import simubatch
+from simubatch import ISSUES, simuler_lot
+from simucombats import ENVIRONNEMENTS, TYPES_UNITES, Armee, calcul_pertes, combat
+
+
+def _lot(aleatoire, n):
+    attaquants = np.zeros((n, len(TYPES_UNITES)), dtype=np.int64)
+    defenseurs = np.zeros((n, len(TYPES_UNITES)), dtype=np.int64)
+    for comptes in (attaquants, defenseurs):
+        for ligne in range(n):
+            maximum = 10 ** aleatoire.randint(1, 9)
+            for i in aleatoire.sample(range(len(TYPES_UNITES)), aleatoire.randint(1, 6)):
+                comptes[ligne, i] = aleatoire.randint(1, maximum)
+    bonus = [[[aleatoire.randint(0, 40) for _ in range(4)] for _ in range(n)] for _ in range(2)]
+    environments = [aleatoire.choice(ENVIRONNEMENTS) for _ in range(n)]
+    return attaquants, defenseurs, bonus[0], bonus[1], environments
+
+
+def _verifier(attaquants, defenseurs, bonus_att, bonus_def, environments):
+    resultat = simuler_lot(attaquants, defenseurs, bonus_att, bonus_def, environments)
+    for ligne in range(len(attaquants)):
+        attaquant = Armee("A", attaquants[ligne].tolist(), *bonus_att[ligne])
+        defenseur = Armee("D", defenseurs[ligne].tolist(), *bonus_def[ligne])
+        rapport = combat(attaquant, defenseur, environments[ligne], detail="issue")
+        assert resultat.attaquants[ligne].tolist() == list(attaquant), ligne
+        assert resultat.defenseurs[ligne].tolist() == list(defenseur), ligne
+        assert resultat.tours[ligne] == rapport.nombre_tours, ligne
+        assert ISSUES[resultat.issues[ligne]] == rapport.issue, ligne
+
+
+@pytest.mark.parametrize("seuil", [0, 10**9])
+def test_lot_identique_a_combat(monkeypatch, seuil):
+    # Les lignes douteuses sont rejouées par _pertes_lot (seuil 0) ou par calcul_pertes
+    monkeypatch.setattr(simubatch, "_SEUIL_VECTORISATION", seuil)
+    _verifier(*_lot(random.Random(2), 3000))
+
+
+def test_petits_lots_identiques_a_combat():
+    aleatoire = random.Random(3)
+    for _ in range(50):
+        _verifier(*_lot(aleatoire, aleatoire.randint(1, 20)))
+
+
+@pytest.mark.parametrize("seuil", [0, 10**9])
+def test_degats_au_ras_d_un_multiple_de_la_vie(monkeypatch, seuil):
+    # Là où la borne d'erreur décide seule : dégâts à quelques ulp de la vie cumulée
+    # d'un nombre entier d'unités, y compris pour des vies qui ne tombent pas sur la grille
+    monkeypatch.setattr(simubatch, "_SEUIL_VECTORISATION", seuil)
+    aleatoire = random.Random(5)
+    n = 4000
+    types = np.arange(len(TYPES_UNITES))
+    vies = np.array([[aleatoire.choice([aleatoire.uniform(0.5, 500), float(aleatoire.randint(1, 500))])
+                      for _ in range(n)] for _ in types])
+    comptes = np.array([[aleatoire.choice([0, aleatoire.randint(1, 10 ** aleatoire.randint(1, 12))])
+                         for _ in range(n)] for _ in types], dtype=np.int64)
+    degats = np.empty(n)
+    for ligne in range(n):
+        j = aleatoire.randrange(len(types))
+        cible = sum(float(comptes[i, ligne]) * vies[i, ligne] for i in range(j))
+        cible += aleatoire.randint(0, int(comptes[j, ligne])) * vies[j, ligne]
+        sens = aleatoire.choice([np.inf, -np.inf])
+        for _ in range(aleatoire.randint(0, 4)):
+            cible = np.nextafter(cible, sens)
+        degats[ligne] = max(cible, 1.0)
+    attendus = comptes.copy()
+    for ligne in range(n):
+        d = float(degats[ligne])
+        for i in types:
+            morts, d = calcul_pertes(d, float(vies[i, ligne]), int(comptes[i, ligne]))
+            attendus[i, ligne] -= morts
+    simubatch._appliquer_pertes(comptes, degats.copy(), vies, types, simubatch._somme(vies, comptes, types))
+    assert (comptes == attendus).all()
@@ -0,0 +1,51 @@
+"""Stockage des armées : validation et lecture des effectifs."""
+
+import pytest
+
+from simucombats import TYPES_UNITES, Armee, Joueur
+from stockage import Stockage, comptes_depuis_donnees
+
+
+@pytest.fixture
+def stockage(tmp_path):
+    return Stockage(str(tmp_path / "armees.db"))
+
+
+def test_effectif_negatif_refuse(stockage):
+    with pytest.raises(ValueError):
+        stockage.enregistrer_armee("a", [0, -5] + [0] * (len(TYPES_UNITES) - 2))
+    assert stockage.armees() == []
+
+
+def test_import_effectif_negatif_refuse(stockage):
+    with pytest.raises(ValueError):
+        stockage.importer([{"nom": "a", "comptes": {"Tank": 10}}, {"nom": "b", "comptes": {"Tank": -5}}])
+    assert stockage.armees() == []
+
+
+def test_route_effectif_negatif(monkeypatch, stockage):
+    import app
+
+    monkeypatch.setattr(app, "stockage", stockage)
+    reponse = app.app.test_client().post("/armees", json={"nom": "a", "comptes": {"Tank": -5}}).get_json()
+    assert reponse["status"] == "error"
+    assert stockage.armees() == []
+
+
+@pytest.mark.parametrize("route", ["/armees", "/profils"])
+def test_limite_invalide(monkeypatch, stockage, route):
+    import app
+
+    monkeypatch.setattr(app, "stockage", stockage)
+    reponse = app.app.test_client().get(route + "?limite=abc")
+    assert reponse.status_code == 400
+    assert reponse.get_json()["status"] == "error"
+
+
+def test_unite_repetee_comme_le_texte(stockage):
+    texte = "10 Tanks, 3 Esclaves, 5 Tanks"
+    armee_id = stockage.enregistrer_armee("a", comptes_depuis_donnees({"armee": texte}))
+    joueur = Joueur("J")
+    joueur.importer_unites_depuis_texte(texte)
+    assert list(stockage.armee(armee_id)) == list(Armee.depuis_joueur(joueur))
+    assert stockage.description_armee(armee_id)["comptes"] == {"Esclave": 3, "Tank": 5}
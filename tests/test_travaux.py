@@ -0,0 +1,57 @@
+"""File de travaux : limites par client et annulation."""
+
+import threading
+import time
+
+import pytest
+
+from travaux import ANNULE, TERMINE, FilePleine, FileTravaux
+
+
+def _attendre(travail, delai=5.0):
+    fin = time.time() + delai
+    while travail.etat not in (TERMINE, ANNULE) and time.time() < fin:
+        time.sleep(0.005)
+
+
+def test_limite_par_client():
+    file = FileTravaux(workers=1, capacite=10, par_client=2)
+    liberer = threading.Event()
+    travaux = [file.soumettre(lambda travail: liberer.wait(5), client="a") for _ in range(2)]
+    with pytest.raises(FilePleine):
+        file.soumettre(lambda travail: None, client="a")
+    autre = file.soumettre(lambda travail: 42, client="b")
+    liberer.set()
+    _attendre(autre)
+    assert autre.resultat == 42
+    for travail in travaux:
+        _attendre(travail)
+
+
+def test_annulation():
+    file = FileTravaux(workers=1)
+
+    def long(travail):
+        for tour in range(1, 1000):
+            travail.suivi(tour)
+            time.sleep(0.005)
+
+    travail = file.soumettre(long, client="a")
+    time.sleep(0.05)
+    assert file.annuler(travail.id)
+    _attendre(travail)
+    assert travail.etat == ANNULE
+
+
+def test_en_tete_x_client_ne_contourne_pas_la_limite(monkeypatch):
+    import app
+
+    liberer = threading.Event()
+    file = FileTravaux(workers=1, capacite=10, par_client=2)
+    monkeypatch.setattr(app, "file_travaux", file)
+    monkeypatch.setattr(app, "_simuler_travail", lambda travail, *args: liberer.wait(5))
+    client = app.app.test_client()
+    codes = [client.post("/travaux", json={"environment": "terrain"}, headers={"X-Client": f"c{i}"}).status_code
+             for i in range(4)]
+    liberer.set()
+    assert codes == [202, 202, 429, 429]
@@ -0,0 +1,145 @@
+"""
+File de travaux en mémoire pour les simulations longues : soumission immédiate,
+exécution dans un pool borné de threads, suivi de la progression et annulation.
+Aucun service externe n'est nécessaire.
+"""
+
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+
+EN_ATTENTE = "en_attente"
+EN_COURS = "en_cours"
+TERMINE = "termine"
+ERREUR = "erreur"
+ANNULE = "annule"
+ETATS_FINAUX = (TERMINE, ERREUR, ANNULE)
+
+
+class FilePleine(Exception):
+    """La file, ou la part d'un client, a atteint sa limite de travaux en attente."""
+
+
+class TravailAnnule(Exception):
+    """Levée dans un travail dont l'annulation a été demandée."""
+
+
+class Travail:
+    """
+    Un travail soumis : état, progression, résultat ou erreur. `client` est l'identité qui
+    sert aux limites (fixée par le serveur) ; `libelle` n'est qu'une étiquette d'affichage.
+    """
+
+    def __init__(self, client, libelle=None):
+        self.id = uuid.uuid4().hex
+        self.client = client
+        self.libelle = libelle
+        self.etat = EN_ATTENTE
+        self.progression = {}
+        self.resultat = None
+        self.erreur = None
+        self.soumis = time.time()
+        self.fin = None
+        self._annulation = threading.Event()
+        self._future = None
+
+    def suivi(self, tour):
+        """À passer comme `suivi` à combat : note le tour en cours et interrompt si annulé."""
+        if self._annulation.is_set():
+            raise TravailAnnule()
+        self.progression = {"tour": tour}
+
+    def annule(self):
+        return self._annulation.is_set()
+
+    def vers_dict(self):
+        return {
+            "id": self.id,
+            "etat": self.etat,
+            "libelle": self.libelle,
+            "progression": self.progression,
+            "erreur": self.erreur,
+            "soumis": self.soumis,
+            "fin": self.fin,
+        }
+
+
+class FileTravaux:
+    """
+    Exécute des fonctions `fonction(travail, *args)` dans `workers` threads.
+
+    - capacite : nombre maximal de travaux en attente ou en cours, tous clients confondus.
+    - par_client : nombre maximal de travaux en attente ou en cours pour un même client,
+      pour qu'un client ne puisse pas occuper toute la file.
+    - conservation : durée en secondes pendant laquelle un travail terminé reste consultable.
+    Au-delà d'une limite, `soumettre` lève FilePleine.
+    """
+
+    def __init__(self, workers=2, capacite=64, par_client=8, conservation=600.0):
+        self.capacite = capacite
+        self.par_client = par_client
+        self.conservation = conservation
+        self._travaux = {}
+        self._verrou = threading.Lock()
+        self._executeur = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="travail")
+
+    def soumettre(self, fonction, *args, client=None, libelle=None):
+        with self._verrou:
+            self._purger()
+            actifs = [t for t in self._travaux.values() if t.etat not in ETATS_FINAUX]
+            if len(actifs) >= self.capacite:
+                raise FilePleine(f"File pleine ({self.capacite} travaux en cours)")
+            if sum(1 for t in actifs if t.client == client) >= self.par_client:
+                raise FilePleine(f"Trop de travaux en cours pour ce client ({self.par_client} au maximum)")
+            travail = Travail(client, libelle)
+            self._travaux[travail.id] = travail
+            travail._future = self._executeur.submit(self._executer, travail, fonction, args)
+        return travail
+
+    def obtenir(self, travail_id):
+        with self._verrou:
+            return self._travaux.get(travail_id)
+
+    def annuler(self, travail_id):
+        """
+        Demande l'annulation d'un travail. Un travail en attente est retiré de la file ;
+        un travail en cours s'arrête au prochain appel de `travail.suivi`.
+        Retourne False si le travail est inconnu ou déjà terminé.
+        """
+        with self._verrou:
+            travail = self._travaux.get(travail_id)
+            if travail is None or travail.etat in ETATS_FINAUX:
+                return False
+            travail._annulation.set()
+            if travail._future.cancel():
+                travail.etat = ANNULE
+                travail.fin = time.time()
+        return True
+
+    def statistiques(self):
+        with self._verrou:
+            etats = [t.etat for t in self._travaux.values()]
+        return {etat: etats.count(etat) for etat in (EN_ATTENTE, EN_COURS) + ETATS_FINAUX}
+
+    def _executer(self, travail, fonction, args):
+        if travail.annule():
+            travail.etat = ANNULE
+            travail.fin = time.time()
+            return
+        travail.etat = EN_COURS
+        try:
+            travail.resultat = fonction(travail, *args)
+            travail.etat = TERMINE
+        except TravailAnnule:
+            travail.etat = ANNULE
+        except Exception as e:
+            travail.erreur = str(e)
+            travail.etat = ERREUR
+        travail.fin = time.time()
+
+    def _purger(self):
+        limite = time.time() - self.conservation
+        for travail_id in [i for i, t in self._travaux.items() if t.fin is not None and t.fin < limite]:
+            del self._travaux[travail_id]